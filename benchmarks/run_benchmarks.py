@@ -0,0 +1,276 @@
+"""
+Offline micro-benchmarks for the integration's hot paths.
+
+Run from the repository root inside the development environment:
+
+    python -m benchmarks.run_benchmarks --save baseline
+    python -m benchmarks.run_benchmarks --compare baseline
+
+Results are written to benchmarks/baselines/<name>.json. With --compare each
+benchmark is reported against the named baseline as a speedup factor.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import tempfile
+import time
+import timeit
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+from homeassistant.core import HomeAssistant
+
+from custom_components.span_panel import binary_sensor, sensor
+from custom_components.span_panel.const import COORDINATOR, DOMAIN
+from custom_components.span_panel.coordinator import SpanPanelCoordinator
+from custom_components.span_panel.options import (BATTERY_ENABLE,
+                                                  INVERTER_ENABLE)
+from custom_components.span_panel.span_panel import SpanPanel
+from custom_components.span_panel.span_panel_aggregates import \
+    SpanPanelAggregates
+from custom_components.span_panel.span_panel_rollup import SpanPanelRollupStore
+from custom_components.span_panel.span_panel_schema import (
+    CIRCUIT_SCHEMA, PANEL_SCHEMA, STATUS_SCHEMA, SpanPanelSchemaRegistry)
+from scripts.span_panel_emulator import SpanPanelEmulator
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = Path(__file__).resolve().parent / "baselines"
+
+DEFAULT_SIZES = (16, 32, 64, 200)
+REPEAT = 5
+
+
+def measure(func: Callable[[], Any], repeat: int = REPEAT) -> dict[str, float]:
+    """Time func and return per-call statistics in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    runs = [elapsed / number * 1e6 for elapsed in timer.repeat(repeat, number)]
+    return {
+        "min_us": min(runs),
+        "median_us": statistics.median(runs),
+        "calls": number,
+    }
+
+
+def measure_memory(func: Callable[[], Any]) -> dict[str, int]:
+    """Return the peak memory allocated by one call of func in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": peak}
+
+
+def bench_parsing(emulator: SpanPanelEmulator) -> dict[str, dict[str, float]]:
+    status = emulator.status_payload()
+    panel = emulator.panel_payload()
+    circuits = emulator.circuits_payload()["circuits"]
+    # Parsers built once for the payload shape, as on every poll after
+    # the first on a firmware version
+    schemas = SpanPanelSchemaRegistry()
+    return {
+        "hardware_status_parse": measure(
+            lambda: schemas.parse(STATUS_SCHEMA, status)
+        ),
+        "panel_data_parse": measure(lambda: schemas.parse(PANEL_SCHEMA, panel)),
+        "circuits_parse": measure(
+            lambda: schemas.parse_each(CIRCUIT_SCHEMA, circuits)
+        ),
+        "schema_build": measure(
+            lambda: SpanPanelSchemaRegistry().parse_each(CIRCUIT_SCHEMA, circuits)
+        ),
+    }
+
+
+async def async_measure(
+    func: Callable[[], Awaitable[Any]], repeat: int = REPEAT
+) -> dict[str, float]:
+    """Time an async callable like measure, awaiting it in the running loop."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        if time.perf_counter() - start >= 0.2:
+            break
+        number *= 2
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        runs.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        "min_us": min(runs),
+        "median_us": statistics.median(runs),
+        "calls": number,
+    }
+
+
+async def bench_update(
+    emulator: SpanPanelEmulator,
+) -> tuple[SpanPanel, dict[str, dict[str, float]]]:
+    client = httpx.AsyncClient(transport=emulator.transport())
+    span_panel = SpanPanel(
+        "emulator", access_token=emulator.access_token, async_client=client
+    )
+    await span_panel.update()
+
+    async def update() -> None:
+        # Bypass the freshness window so every run goes through the transport
+        span_panel.api.invalidate()
+        await span_panel.update()
+
+    def snapshot_read() -> None:
+        _ = span_panel.status, span_panel.panel
+        for circuit_id in span_panel.circuits:
+            _ = span_panel.circuits[circuit_id]
+
+    def circuit_table_read() -> None:
+        table = span_panel.circuit_table
+        for circuit_id in table.ids:
+            table.instant_power[table.index[circuit_id]]
+        table.total_power()
+
+    def aggregates() -> None:
+        snapshot = span_panel.snapshot
+        SpanPanelAggregates.compute(
+            snapshot.circuit_table, span_panel.panel.instant_grid_power
+        )
+
+    rollups = SpanPanelRollupStore()
+    rollup_clock = itertools.count(step=15)
+
+    def rollup_add() -> None:
+        # One update of every circuit 15 seconds apart, closing buckets
+        table = span_panel.circuit_table
+        rollups.add(next(rollup_clock), dict(zip(table.ids, table.instant_power)))
+
+    return span_panel, {
+        "span_panel_update": await async_measure(update),
+        "aggregates": {**measure(aggregates), **measure_memory(aggregates)},
+        "rollup_add": measure(rollup_add),
+        "snapshot_read": {**measure(snapshot_read), **measure_memory(snapshot_read)},
+        "circuit_table_read": {
+            **measure(circuit_table_read),
+            **measure_memory(circuit_table_read),
+        },
+    }
+
+
+async def bench_fan_out(
+    hass: HomeAssistant, span_panel: SpanPanel
+) -> dict[str, dict[str, float]]:
+    coordinator = SpanPanelCoordinator(hass, span_panel, "benchmark", 15)
+    coordinator.async_set_updated_data(span_panel)
+    entry = SimpleNamespace(
+        entry_id="benchmark",
+        options={BATTERY_ENABLE: False, INVERTER_ENABLE: False},
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {COORDINATOR: coordinator}
+    entities: list[Any] = []
+    for platform_module in (sensor, binary_sensor):
+        await platform_module.async_setup_entry(hass, entry, entities.extend)
+    for entity in entities:
+        entity.hass = hass
+        await entity.async_added_to_hass()
+    readers = [
+        entity for entity in entities if isinstance(entity, sensor.SpanSensorBase)
+    ]
+    binary = [
+        entity
+        for entity in entities
+        if isinstance(entity, binary_sensor.SpanPanelBinarySensor)
+    ]
+
+    def read_all() -> None:
+        for entity in readers:
+            _ = entity.native_value
+        for entity in binary:
+            _ = entity.is_on
+
+    results = {
+        # Values of every entity computed once, as after a full update
+        "entity_values_update": {
+            **measure(coordinator.async_update_entity_values),
+            **measure_memory(coordinator.async_update_entity_values),
+            "entities": len(entities),
+        },
+        "entity_fan_out": {
+            **measure(read_all),
+            **measure_memory(read_all),
+            "entities": len(entities),
+        },
+    }
+    await coordinator.async_shutdown()
+    return results
+
+
+async def async_run(sizes: list[int]) -> dict[str, Any]:
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="span_bench_"))
+    results: dict[str, Any] = {}
+    for size in sizes:
+        emulator = SpanPanelEmulator(circuit_count=size)
+        span_panel, update_results = await bench_update(emulator)
+        results[str(size)] = {
+            **bench_parsing(emulator),
+            **update_results,
+            **await bench_fan_out(hass, span_panel),
+        }
+        await span_panel.close()
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> None:
+    print(f"{'circuits':>8}  {'benchmark':<28}{'median us':>12}{'speedup':>10}")
+    for size, benches in current["results"].items():
+        for name, stats in benches.items():
+            previous = baseline["results"].get(size, {}).get(name)
+            speedup = (
+                f"{previous['median_us'] / stats['median_us']:.2f}x"
+                if previous
+                else "-"
+            )
+            print(
+                f"{size:>8}  {name:<28}{stats['median_us']:>12.1f}{speedup:>10}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--circuits", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--save", metavar="NAME", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="NAME", help="compare with a baseline")
+    args = parser.parse_args()
+
+    current = asyncio.run(async_run(list(args.circuits)))
+    baseline: dict[str, Any] = {"results": {}}
+    if args.compare:
+        baseline = json.loads((BASELINES / f"{args.compare}.json").read_text())
+    compare(current, baseline)
+    if args.save:
+        BASELINES.mkdir(exist_ok=True)
+        path = BASELINES / f"{args.save}.json"
+        path.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Saved {path.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
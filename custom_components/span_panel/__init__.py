@@ -7,13 +7,23 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (CONF_ACCESS_TOKEN, CONF_HOST,
                                  CONF_SCAN_INTERVAL, Platform)
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.httpx_client import get_async_client
-
-from .const import COORDINATOR, DEFAULT_SCAN_INTERVAL, DOMAIN, NAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.httpx_client import create_async_httpx_client, httpx
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.ssl import client_context
+
+from .const import (API_TIMEOUT, COORDINATOR, DEFAULT_SCAN_INTERVAL, DOMAIN,
+                    FLEET, NAME)
 from .coordinator import SpanPanelCoordinator
+from .fleet import SpanPanelFleet
 from .options import Options
+from .services import async_setup_services
 from .span_panel import SpanPanel
+from .span_panel_api import HTTP_LIMITS
+from .span_panel_recorder import SpanPanelWireRecorder
+from .span_panel_rollup import SpanPanelRollupStore
+from .websocket import async_setup_websocket_api
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -24,6 +34,17 @@ PLATFORMS: list[Platform] = [
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """
+    Set up the services and websocket commands shared by every panel.
+    """
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
@@ -35,11 +56,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     _LOGGER.debug("ASYNC_SETUP_ENTRY %s", host)
 
+    options = Options(entry)
+    recorder: SpanPanelWireRecorder | None = None
+    if options.enable_wire_recorder:
+        recorder = SpanPanelWireRecorder(
+            hass.config.path(DOMAIN, f"{entry.entry_id}.wire.jsonl")
+        )
+        _LOGGER.info("Recording Span Panel traffic to %s", recorder.path)
+
+    fleet: SpanPanelFleet | None = None
+    if options.enable_fleet_mode:
+        fleet = hass.data.setdefault(DOMAIN, {}).get(FLEET)
+        if fleet is None:
+            fleet = hass.data[DOMAIN][FLEET] = SpanPanelFleet(hass)
+
+    # One keep-alive pool per panel under a Home Assistant client, using its
+    # preloaded SSL context. The pool is closed with the panel on unload.
+    transport = httpx.AsyncHTTPTransport(verify=client_context(), limits=HTTP_LIMITS)
+    async_client = create_async_httpx_client(
+        hass, auto_cleanup=False, transport=transport, timeout=API_TIMEOUT
+    )
     span_panel = SpanPanel(
         host=config[CONF_HOST],
         access_token=config[CONF_ACCESS_TOKEN],
-        options=Options(entry),
-        async_client=get_async_client(hass),
+        options=options,
+        async_client=async_client,
+        transport=transport,
+        recorder=recorder,
+        request_limiter=fleet.request_limiter if fleet is not None else None,
     )
 
     _LOGGER.debug("ASYNC_SETUP_ENTRY panel %s", span_panel)
@@ -49,10 +93,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     coordinator = SpanPanelCoordinator(
-        hass, span_panel, name, update_interval=scan_interval
+        hass,
+        span_panel,
+        name,
+        update_interval=scan_interval,
+        endpoint_intervals=options.endpoint_intervals,
+        external_timer=fleet is not None,
+        rollups=(
+            SpanPanelRollupStore(options.rollup_capacity)
+            if options.enable_rollup_store
+            else None
+        ),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        await span_panel.close()
+        _async_leave_fleet(hass, coordinator)
+        raise
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
@@ -61,6 +120,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         COORDINATOR: coordinator,
         NAME: name,
     }
+    if fleet is not None:
+        fleet.async_add(coordinator)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -73,11 +134,28 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     _LOGGER.debug("ASYNC_UNLOAD")
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: SpanPanelCoordinator = data[COORDINATOR]
+        _async_leave_fleet(hass, coordinator)
+        await coordinator.span_panel.close()
 
     return unload_ok
 
 
+@callback
+def _async_leave_fleet(hass: HomeAssistant, coordinator: SpanPanelCoordinator) -> None:
+    """
+    Stop polling a panel as part of the fleet, and drop the fleet once empty.
+    """
+    fleet: SpanPanelFleet | None = hass.data.get(DOMAIN, {}).get(FLEET)
+    if fleet is None:
+        return
+    fleet.async_remove(coordinator)
+    if not fleet:
+        fleet.async_shutdown()
+        hass.data[DOMAIN].pop(FLEET)
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """
     Update listener.
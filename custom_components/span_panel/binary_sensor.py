@@ -14,9 +14,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (COORDINATOR, DOMAIN, SYSTEM_DOOR_STATE_CLOSED,
-                    SYSTEM_DOOR_STATE_OPEN, USE_DEVICE_PREFIX)
-from .coordinator import SpanPanelCoordinator
+from .const import (COORDINATOR, DOMAIN, ENDPOINT_STATUS,
+                    SYSTEM_DOOR_STATE_CLOSED, SYSTEM_DOOR_STATE_OPEN,
+                    USE_DEVICE_PREFIX)
+from .coordinator import SpanPanelCoordinator, SpanPanelListenerContext
 from .span_panel import SpanPanel
 from .span_panel_hardware_status import SpanPanelHardwareStatus
 from .util import panel_to_device_info
@@ -27,6 +28,8 @@ _LOGGER = logging.getLogger(__name__)
 @dataclass(frozen=True)
 class SpanPanelRequiredKeysMixin:
     value_fn: Callable[[SpanPanelHardwareStatus], bool | None]
+    # Status field the value depends on, to skip updates when it is unchanged
+    source_field: str
 
 
 @dataclass(frozen=True)
@@ -45,24 +48,28 @@ BINARY_SENSORS = (
         device_class=BinarySensorDeviceClass.TAMPER,
         value_fn=lambda status_data: None if status_data.door_state not in [SYSTEM_DOOR_STATE_CLOSED, SYSTEM_DOOR_STATE_OPEN] 
                                     else not status_data.is_door_closed,
+        source_field="door_state",
     ),
     SpanPanelBinarySensorEntityDescription(
         key="eth0Link",
         name="Ethernet Link",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         value_fn=lambda status_data: status_data.is_ethernet_connected,
+        source_field="is_ethernet_connected",
     ),
     SpanPanelBinarySensorEntityDescription(
         key="wlanLink",
         name="Wi-Fi Link",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         value_fn=lambda status_data: status_data.is_wifi_connected,
+        source_field="is_wifi_connected",
     ),
     SpanPanelBinarySensorEntityDescription(
         key="wwanLink",
         name="Cellular Link",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         value_fn=lambda status_data: status_data.is_cellular_connected,
+        source_field="is_cellular_connected",
     ),
 )
 
@@ -78,7 +85,12 @@ class SpanPanelBinarySensor(
         description: SpanPanelBinarySensorEntityDescription,
     ) -> None:
         """Initialize Span Panel Circuit entity."""
-        super().__init__(data_coordinator, context=description)
+        super().__init__(
+            data_coordinator,
+            context=SpanPanelListenerContext(
+                ENDPOINT_STATUS, fields=frozenset({description.source_field})
+            ),
+        )
         span_panel: SpanPanel = data_coordinator.data
 
         self.entity_description = description
@@ -101,19 +113,28 @@ class SpanPanelBinarySensor(
 
         _LOGGER.debug("CREATE BINSENSOR [%s]", self._attr_name)
 
+    async def async_added_to_hass(self) -> None:
+        """Have the coordinator compute the value on every update."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_entity_value(
+                cast(str, self._attr_unique_id),
+                self.compute_value,
+                self.coordinator_context,
+            )
+        )
+
     @property
     def is_on(self) -> bool | None:
-        """Return the status of the sensor."""
-        # Get atomic snapshot of panel data
-        span_panel: SpanPanel = self.coordinator.data
+        """Return the value computed by the coordinator for this update."""
+        return self.coordinator.entity_values.get(cast(str, self._attr_unique_id))
+
+    def compute_value(self, span_panel: SpanPanel) -> bool | None:
+        """Compute the status of the sensor, once per coordinator update."""
         description = cast(
             SpanPanelBinarySensorEntityDescription, self.entity_description
         )
-        # Get atomic snapshot of status data
-        status = span_panel.status
-        status_is_on = description.value_fn(status)
-        _LOGGER.debug("BINSENSOR [%s] is_on:[%s]", self._attr_name, status_is_on)
-        return status_is_on
+        return description.value_fn(span_panel.status)
 
     @property
     def available(self) -> bool:
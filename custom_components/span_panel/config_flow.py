@@ -17,9 +17,19 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.httpx_client import get_async_client
 from homeassistant.util.network import is_ipv4_address
 
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, USE_DEVICE_PREFIX
-from .options import (BATTERY_ENABLE, INVERTER_ENABLE, INVERTER_LEG1,
-                      INVERTER_LEG2)
+from .const import (DEFAULT_SCAN_INTERVAL, DOMAIN, ENDPOINT_BATTERY,
+                    ENDPOINT_CIRCUITS, ENDPOINT_PANEL, ENDPOINT_STATUS,
+                    ROLLUP_DEFAULT_CAPACITY, USE_DEVICE_PREFIX)
+from .options import (AGGREGATE_SENSORS_ENABLE, BATTERY_ENABLE,
+                      BATTERY_SCAN_INTERVAL, BRANCH_SENSORS_ENABLE,
+                      CIRCUITS_SCAN_INTERVAL, ENDPOINT_SCAN_INTERVALS,
+                      ENERGY_DEADBAND, ENERGY_HEARTBEAT,
+                      ENERGY_MIN_WRITE_INTERVAL, FLEET_MODE_ENABLE,
+                      INVERTER_ENABLE, INVERTER_LEG1, INVERTER_LEG2,
+                      PANEL_SCAN_INTERVAL, POWER_DEADBAND, POWER_HEARTBEAT,
+                      POWER_MIN_WRITE_INTERVAL, POWER_RELATIVE_DEADBAND,
+                      ROLLUP_CAPACITY, ROLLUP_ENABLE, STATUS_SCAN_INTERVAL,
+                      WIRE_RECORDER_ENABLE, default_endpoint_intervals)
 from .span_panel_api import SpanPanelApi
 
 _LOGGER = logging.getLogger(__name__)
@@ -391,6 +401,47 @@ OPTIONS_SCHEMA = vol.Schema(
         vol.Optional(INVERTER_LEG2): vol.All(
             vol.Coerce(int), vol.Range(min=0)
         ),
+        vol.Optional(STATUS_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=5)
+        ),
+        vol.Optional(PANEL_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=2)
+        ),
+        vol.Optional(CIRCUITS_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=2)
+        ),
+        vol.Optional(BATTERY_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=5)
+        ),
+        vol.Optional(WIRE_RECORDER_ENABLE): bool,
+        vol.Optional(FLEET_MODE_ENABLE): bool,
+        vol.Optional(BRANCH_SENSORS_ENABLE): bool,
+        vol.Optional(AGGREGATE_SENSORS_ENABLE): bool,
+        vol.Optional(ROLLUP_ENABLE): bool,
+        vol.Optional(ROLLUP_CAPACITY): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=10000)
+        ),
+        vol.Optional(POWER_DEADBAND): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(POWER_RELATIVE_DEADBAND): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(POWER_MIN_WRITE_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(POWER_HEARTBEAT): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ENERGY_DEADBAND): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ENERGY_MIN_WRITE_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ENERGY_HEARTBEAT): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
     }
 )
 
@@ -418,16 +469,66 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             use_prefix = self.entry.options.get(USE_DEVICE_PREFIX, False)
             if use_prefix:
                 user_input[USE_DEVICE_PREFIX] = use_prefix
+            # An endpoint interval left at the default shown in the form, or
+            # at the default of the new scan interval, is not stored so that
+            # it keeps following the scan interval
+            shown = default_endpoint_intervals(
+                self.entry.options.get(
+                    CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL.seconds
+                )
+            )
+            submitted = default_endpoint_intervals(
+                user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL.seconds)
+            )
+            for endpoint, key in ENDPOINT_SCAN_INTERVALS.items():
+                if key in user_input and user_input[key] in (
+                    shown[endpoint],
+                    submitted[endpoint],
+                ):
+                    del user_input[key]
             return self.async_create_entry(title="", data=user_input)
 
+        scan_interval = self.entry.options.get(
+            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL.seconds
+        )
+        intervals = default_endpoint_intervals(scan_interval)
         defaults = {
-            CONF_SCAN_INTERVAL: self.entry.options.get(
-                CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL.seconds
-            ),
+            CONF_SCAN_INTERVAL: scan_interval,
             BATTERY_ENABLE: self.entry.options.get("enable_battery_percentage", False),
             INVERTER_ENABLE: self.entry.options.get("enable_solar_circuit", False),
             INVERTER_LEG1: self.entry.options.get(INVERTER_LEG1, 0),
             INVERTER_LEG2: self.entry.options.get(INVERTER_LEG2, 0),
+            STATUS_SCAN_INTERVAL: self.entry.options.get(
+                STATUS_SCAN_INTERVAL, intervals[ENDPOINT_STATUS]
+            ),
+            PANEL_SCAN_INTERVAL: self.entry.options.get(
+                PANEL_SCAN_INTERVAL, intervals[ENDPOINT_PANEL]
+            ),
+            CIRCUITS_SCAN_INTERVAL: self.entry.options.get(
+                CIRCUITS_SCAN_INTERVAL, intervals[ENDPOINT_CIRCUITS]
+            ),
+            BATTERY_SCAN_INTERVAL: self.entry.options.get(
+                BATTERY_SCAN_INTERVAL, intervals[ENDPOINT_BATTERY]
+            ),
+            WIRE_RECORDER_ENABLE: self.entry.options.get(WIRE_RECORDER_ENABLE, False),
+            FLEET_MODE_ENABLE: self.entry.options.get(FLEET_MODE_ENABLE, False),
+            BRANCH_SENSORS_ENABLE: self.entry.options.get(
+                BRANCH_SENSORS_ENABLE, False
+            ),
+            AGGREGATE_SENSORS_ENABLE: self.entry.options.get(
+                AGGREGATE_SENSORS_ENABLE, False
+            ),
+            ROLLUP_ENABLE: self.entry.options.get(ROLLUP_ENABLE, False),
+            ROLLUP_CAPACITY: self.entry.options.get(
+                ROLLUP_CAPACITY, ROLLUP_DEFAULT_CAPACITY
+            ),
+            POWER_DEADBAND: self.entry.options.get(POWER_DEADBAND, 0.0),
+            POWER_RELATIVE_DEADBAND: self.entry.options.get(POWER_RELATIVE_DEADBAND, 0.0),
+            POWER_MIN_WRITE_INTERVAL: self.entry.options.get(POWER_MIN_WRITE_INTERVAL, 0.0),
+            POWER_HEARTBEAT: self.entry.options.get(POWER_HEARTBEAT, 0.0),
+            ENERGY_DEADBAND: self.entry.options.get(ENERGY_DEADBAND, 0.0),
+            ENERGY_MIN_WRITE_INTERVAL: self.entry.options.get(ENERGY_MIN_WRITE_INTERVAL, 0.0),
+            ENERGY_HEARTBEAT: self.entry.options.get(ENERGY_HEARTBEAT, 0.0),
         }
 
         return self.async_show_form(
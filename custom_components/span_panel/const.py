@@ -16,6 +16,12 @@ URL_PANEL = "http://{}/api/v1/panel"
 URL_REGISTER = "http://{}/api/v1/auth/register"
 URL_STORAGE_BATTERY = "http://{}/api/v1/storage/soe"
 
+ENDPOINT_STATUS = "status"
+ENDPOINT_PANEL = "panel"
+ENDPOINT_CIRCUITS = "circuits"
+ENDPOINT_BATTERY = "battery"
+LOW_PRIORITY_ENDPOINTS = frozenset({ENDPOINT_STATUS, ENDPOINT_BATTERY})
+
 STORAGE_BATTERY_PERCENTAGE = "batteryPercentage"
 CIRCUITS_NAME = "name"
 CIRCUITS_RELAY = "relayState"
@@ -49,8 +55,62 @@ PANEL_MAIN_RELAY_STATE_UNKNOWN_VALUE = "UNKNOWN"
 USE_DEVICE_PREFIX = "use_device_prefix"
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=15)
+DEFAULT_SLOW_SCAN_INTERVAL = timedelta(seconds=60)
 API_TIMEOUT = 30
 
+SERVICE_SET_CIRCUITS = "set_circuits"
+# Relay/priority POSTs issued at the same time by the bulk control service.
+CIRCUIT_CONTROL_MAX_CONCURRENCY = 4
+
+SERVICE_START_BURST_CAPTURE = "start_burst_capture"
+EVENT_BURST_CAPTURE = f"{DOMAIN}_burst_capture"
+# Burst captures poll faster than any scan interval, so they are bounded:
+# the ring buffer holds at most BURST_MAX_SAMPLES rows per series.
+BURST_DEFAULT_DURATION = 60
+BURST_MAX_DURATION = 600
+BURST_DEFAULT_INTERVAL = 0.5
+BURST_MIN_INTERVAL = 0.1
+BURST_MAX_SAMPLES = 2400
+BURST_PERCENTILES = (50, 95, 99)
+# Panel power readings sampled by burst captures and the rollup store
+PANEL_POWER_READINGS = ("instant_grid_power", "feedthrough_power")
+
+SERVICE_QUERY_ROLLUPS = "query_rollups"
+# Seconds per bucket of each rollup resolution; raw keeps every update
+ROLLUP_RAW = "raw"
+ROLLUP_RESOLUTIONS = {ROLLUP_RAW: 0, "1m": 60, "15m": 900, "1h": 3600}
+# Rows kept per resolution, for the raw updates and for every rollup
+ROLLUP_DEFAULT_CAPACITY = 120
+
+# Keep-alive pool for the panel's embedded web server. The panel serves a
+# handful of endpoints per poll so a small pool is reused for every request.
+HTTP_MAX_CONNECTIONS = 4
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 4
+HTTP_KEEPALIVE_EXPIRY = 60
+# Seconds a fetched response is reused by callers asking for the same URL.
+API_FRESHNESS_WINDOW = 0.5
+# Endpoints fetched at the same time during a single panel update.
+PANEL_MAX_CONCURRENT_FETCHES = 2
+
+# Each update cycle gets a deadline no longer than its scan interval. Requests
+# connect within DEADLINE_CONNECT_TIMEOUT and read within the time remaining.
+DEADLINE_CONNECT_TIMEOUT = 5
+# Low-priority endpoints are skipped once less than this share of the budget
+# is left; they are fetched again on the next cycle.
+DEADLINE_LOW_PRIORITY_FRACTION = 0.25
+# Extra time past the deadline before the whole update is cancelled.
+DEADLINE_GRACE = 2
+
+# Fleet mode polls every opted-in panel from one shared scheduler.
+FLEET = "fleet"
+# Requests in flight at once across the whole fleet.
+FLEET_MAX_CONCURRENT_REQUESTS = 8
+# Recent polls kept for the fleet latency and throughput statistics.
+FLEET_LATENCY_SAMPLES = 500
+
+# Largest consumers listed by the top consumer sensor
+AGGREGATE_TOP_CONSUMERS = 5
+
 
 class CircuitRelayState(enum.Enum):
     OPEN = "Open"
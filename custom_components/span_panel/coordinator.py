@@ -2,19 +2,92 @@
 
 import asyncio
 import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from datetime import timedelta
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.httpx_client import httpx
 from homeassistant.helpers.update_coordinator import (DataUpdateCoordinator,
                                                       UpdateFailed)
 
-from .const import API_TIMEOUT
-from .span_panel import SpanPanel
+from .const import (API_TIMEOUT, DEADLINE_CONNECT_TIMEOUT, DEADLINE_GRACE,
+                    ENDPOINT_CIRCUITS, ENDPOINT_PANEL)
+from .exceptions import SpanPanelCircuitBreakerOpen, SpanPanelDeadlineExceeded
+from .span_panel import SpanPanel, SpanPanelUpdateResult
+from .span_panel_api import SPAN_PANEL_API_ERRORS
+from .span_panel_deadline import SpanPanelDeadline
+from .span_panel_diff import SpanPanelSnapshotDiff, diff_snapshots
+from .span_panel_rollup import SpanPanelRollupStore
+from .span_panel_snapshot import SpanPanelSnapshot
+from .span_panel_stream import SpanPanelEventSource
 
 _LOGGER = logging.getLogger(__name__)
 
+# Endpoints whose data can be kept current by a stream
+STREAMED_ENDPOINTS = (ENDPOINT_CIRCUITS, ENDPOINT_PANEL)
+
+
+@dataclass(frozen=True)
+class SpanPanelListenerContext:
+    """
+    Listener context naming the data an entity reads: an endpoint, and for
+    circuit entities the circuit and fields. Entities without an endpoint
+    are notified after every update.
+    """
+
+    endpoint: str | None
+    circuit_id: str | None = None
+    fields: frozenset[str] | None = None
+
+    def affected_by(self, diff: SpanPanelSnapshotDiff) -> bool:
+        if self.endpoint is None:
+            return True
+        return diff.changed(self.endpoint, self.circuit_id, self.fields)
+
+
+class SpanPanelEndpointScheduler:
+    """Decide which endpoints are due on each coordinator tick."""
+
+    def __init__(self, intervals: dict[str, int]) -> None:
+        self.intervals = dict(intervals)
+        self.tick = min(self.intervals.values())
+        self._last_fetch: dict[str, float] = {}
+        self._forced: set[str] = set()
+
+    def force(self, endpoints: Iterable[str]) -> None:
+        """Fetch these endpoints on the next tick regardless of cadence."""
+        self._forced.update(endpoints)
+
+    def due(self, now: float | None = None) -> set[str]:
+        """Return the endpoints whose interval has elapsed."""
+        now = time.monotonic() if now is None else now
+        # Allow half a tick of slack so timer drift does not skip a cycle
+        slack = self.tick / 2
+        due = {
+            endpoint
+            for endpoint, interval in self.intervals.items()
+            if endpoint not in self._last_fetch
+            or now - self._last_fetch[endpoint] >= interval - slack
+        }
+        due |= self._forced
+        self._forced = set()
+        return due
+
+    def set_interval(self, endpoint: str, interval: int) -> None:
+        """Change the cadence of one endpoint."""
+        self.intervals[endpoint] = interval
+        self.tick = min(self.intervals.values())
+
+    def mark_fetched(self, endpoints: Iterable[str], now: float | None = None) -> None:
+        """Record the endpoints fetched successfully."""
+        now = time.monotonic() if now is None else now
+        for endpoint in endpoints:
+            self._last_fetch[endpoint] = now
+
 
 class SpanPanelCoordinator(DataUpdateCoordinator[SpanPanel]):
     """Coordinator for Span Panel."""
@@ -25,22 +98,246 @@ class SpanPanelCoordinator(DataUpdateCoordinator[SpanPanel]):
         span_panel: SpanPanel,
         name: str,
         update_interval: int,
+        endpoint_intervals: dict[str, int] | None = None,
+        external_timer: bool = False,
+        rollups: SpanPanelRollupStore | None = None,
     ):
+        self.scheduler: SpanPanelEndpointScheduler | None = None
+        if endpoint_intervals:
+            self.scheduler = SpanPanelEndpointScheduler(endpoint_intervals)
+            update_interval = self.scheduler.tick
+        # Seconds between polls; with an external timer, such as the fleet
+        # scheduler, the coordinator does not schedule refreshes itself
+        self.poll_interval: int = update_interval
         super().__init__(
             hass,
             _LOGGER,
             name=f"span panel {name}",
-            update_interval=timedelta(seconds=update_interval),
+            update_interval=(
+                None if external_timer else timedelta(seconds=update_interval)
+            ),
             always_update=True,
         )
         self.span_panel = span_panel
+        self.last_update_result: SpanPanelUpdateResult | None = None
+        # Consecutive failures per endpoint, reset when the endpoint succeeds
+        self.endpoint_failures: dict[str, int] = {}
+        # Snapshot entities were last notified about, None notifies everyone
+        self._notified_snapshot: SpanPanelSnapshot | None = None
+        self._last_notified_success: bool | None = None
+        self._event_source: SpanPanelEventSource | None = None
+        self._event_task: asyncio.Task[None] | None = None
+        self._stream_notify_pending = False
+        # Poll intervals replaced while a stream is attached
+        self._polled_intervals: dict[str, int] = {}
+        # Entity values by unique_id, recomputed once per notification for
+        # the entities whose data changed
+        self.entity_values: dict[str, Any] = {}
+        # Entities whose value could not be computed from the current data
+        self.entity_value_errors: set[str] = set()
+        self._value_fns: dict[
+            str, tuple[Callable[[SpanPanel], Any], SpanPanelListenerContext | None]
+        ] = {}
+        # Recent readings kept in memory, fed with every new snapshot
+        self.rollups = rollups
+        # Burst capture in progress, and the summary of the last one
+        self.burst_task: asyncio.Task[dict[str, Any]] | None = None
+        self.last_burst_capture: dict[str, Any] | None = None
+
+    def _record_update_result(self, result: SpanPanelUpdateResult) -> None:
+        """Track per-endpoint success and failure of the last update."""
+        self.last_update_result = result
+        for endpoint in result.succeeded:
+            self.endpoint_failures[endpoint] = 0
+        for endpoint in result.failed:
+            self.endpoint_failures[endpoint] = (
+                self.endpoint_failures.get(endpoint, 0) + 1
+            )
+        if result.is_partial:
+            _LOGGER.warning(
+                "Partial Span Panel update, failed endpoints: %s",
+                ", ".join(sorted(result.failed)),
+            )
+
+    async def async_request_endpoint_refresh(self, *endpoints: str) -> None:
+        """Request a refresh that includes the given endpoints."""
+        if self.scheduler is not None:
+            self.scheduler.force(endpoints)
+        await self.async_request_refresh()
+
+    @callback
+    def async_attach_event_source(
+        self, source: SpanPanelEventSource, reconcile_interval: int | None = None
+    ) -> None:
+        """
+        Apply incremental updates from a stream as they arrive. Polling goes
+        on as reconciliation, for the streamed endpoints at reconcile_interval
+        when given.
+        """
+        if self._event_task is not None:
+            raise RuntimeError("An event source is already attached")
+        self._event_source = source
+        if reconcile_interval is not None and self.scheduler is not None:
+            for endpoint in STREAMED_ENDPOINTS:
+                if (interval := self.scheduler.intervals.get(endpoint)) is not None:
+                    self._polled_intervals[endpoint] = interval
+                    self.scheduler.set_interval(
+                        endpoint, max(interval, reconcile_interval)
+                    )
+            self._set_poll_interval(self.scheduler.tick)
+        self._event_task = self.hass.async_create_background_task(
+            self._async_consume_events(source), f"{self.name} event stream"
+        )
+
+    async def async_detach_event_source(self) -> None:
+        """Stop consuming the attached stream and restore polling."""
+        if (task := self._event_task) is None:
+            return
+        if self._event_source is not None:
+            await self._event_source.close()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _async_consume_events(self, source: SpanPanelEventSource) -> None:
+        try:
+            async for event in source.events():
+                if self.span_panel.apply_event(event) is None:
+                    continue
+                if not self._stream_notify_pending:
+                    self._stream_notify_pending = True
+                    self.hass.loop.call_soon(self._async_notify_streamed)
+        except SPAN_PANEL_API_ERRORS as err:
+            _LOGGER.warning("Span Panel event stream failed: %s", err)
+        finally:
+            self._event_source = None
+            self._event_task = None
+            if self.scheduler is not None and self._polled_intervals:
+                for endpoint, interval in self._polled_intervals.items():
+                    self.scheduler.set_interval(endpoint, interval)
+                self._polled_intervals = {}
+                self._set_poll_interval(self.scheduler.tick)
+
+    @callback
+    def _async_notify_streamed(self) -> None:
+        """Notify once for all events applied since the last notification."""
+        self._stream_notify_pending = False
+        self.async_update_listeners()
+
+    def _set_poll_interval(self, interval: int) -> None:
+        self.poll_interval = interval
+        if self.update_interval is not None:
+            self.update_interval = timedelta(seconds=interval)
+
+    async def async_shutdown(self) -> None:
+        """Stop any burst capture and event stream before shutting down."""
+        if (task := self.burst_task) is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.async_detach_event_source()
+        await super().async_shutdown()
+
+    @callback
+    def async_add_entity_value(
+        self,
+        unique_id: str,
+        value_fn: Callable[[SpanPanel], Any],
+        context: SpanPanelListenerContext | None = None,
+    ) -> CALLBACK_TYPE:
+        """
+        Publish the value of an entity in entity_values, computed now and
+        again whenever the data named by the context changes.
+        """
+        self._value_fns[unique_id] = (value_fn, context)
+        self.entity_values[unique_id] = self._compute_value(unique_id, value_fn)
+
+        @callback
+        def remove_entity_value() -> None:
+            self._value_fns.pop(unique_id, None)
+            self.entity_values.pop(unique_id, None)
+            self.entity_value_errors.discard(unique_id)
+
+        return remove_entity_value
+
+    @callback
+    def async_update_entity_values(
+        self, diff: SpanPanelSnapshotDiff | None = None
+    ) -> None:
+        """Recompute entity values, only those affected by diff when given."""
+        values = self.entity_values
+        for unique_id, (value_fn, context) in self._value_fns.items():
+            if diff is None or context is None or context.affected_by(diff):
+                values[unique_id] = self._compute_value(unique_id, value_fn)
+
+    def _compute_value(
+        self, unique_id: str, value_fn: Callable[[SpanPanel], Any]
+    ) -> Any:
+        """
+        Compute one entity value. When the data it reads has not been
+        fetched or is gone, only that entity is marked unavailable; any
+        other error is a bug and propagates.
+        """
+        try:
+            value = value_fn(self.span_panel)
+        except (KeyError, IndexError, RuntimeError) as err:
+            if unique_id not in self.entity_value_errors:
+                _LOGGER.debug("Cannot compute the value of %s: %r", unique_id, err)
+                self.entity_value_errors.add(unique_id)
+            return None
+        self.entity_value_errors.discard(unique_id)
+        return value
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Only notify entities whose data changed since the snapshot they were
+        last notified about, after refreshing their values.
+        """
+        previous = self._notified_snapshot
+        snapshot = self._notified_snapshot = self.span_panel.snapshot
+        if self.rollups is not None and snapshot is not previous:
+            self.rollups.add_snapshot(snapshot, time.time())
+        availability_changed = self._last_notified_success != self.last_update_success
+        self._last_notified_success = self.last_update_success
+        if previous is None or availability_changed:
+            self.async_update_entity_values()
+            super().async_update_listeners()
+            return
+        diff = diff_snapshots(previous, snapshot)
+        self.async_update_entity_values(diff)
+        for update_callback, context in list(self._listeners.values()):
+            if not isinstance(context, SpanPanelListenerContext) or (
+                context.affected_by(diff)
+            ):
+                update_callback()
 
     async def _async_update_data(self) -> SpanPanel:
         """Fetch data from API endpoint."""
+        endpoints = self.scheduler.due() if self.scheduler is not None else None
+        # Budget the cycle so that a slow panel never overruns the interval,
+        # but leave very short intervals at least enough time to connect
+        budget = max(
+            min(float(API_TIMEOUT), self.poll_interval), DEADLINE_CONNECT_TIMEOUT
+        )
+        deadline = SpanPanelDeadline(budget)
         try:
-            _LOGGER.debug("Starting coordinator update")
-            await asyncio.wait_for(self.span_panel.update(), timeout=API_TIMEOUT)
+            _LOGGER.debug("Starting coordinator update for %s", endpoints or "all")
+            await asyncio.wait_for(
+                self.span_panel.update(endpoints, deadline),
+                timeout=budget + DEADLINE_GRACE,
+            )
             _LOGGER.debug("Coordinator update successful - data: %s", self.span_panel)
+        except SpanPanelCircuitBreakerOpen as err:
+            _LOGGER.debug("Skipping Span Panel update: %s", err)
+            raise UpdateFailed(str(err)) from err
+        except SpanPanelDeadlineExceeded as err:
+            _LOGGER.warning("Span Panel update ran out of time: %s", err)
+            raise UpdateFailed(str(err)) from err
         except httpx.HTTPStatusError as err:
             if err.response.status_code == httpx.codes.UNAUTHORIZED:
                 raise ConfigEntryAuthFailed from err
@@ -61,5 +358,11 @@ class SpanPanelCoordinator(DataUpdateCoordinator[SpanPanel]):
                 str(err),
             )
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        finally:
+            if self.span_panel.last_update_result is not None:
+                self._record_update_result(self.span_panel.last_update_result)
 
+        result = self.span_panel.last_update_result
+        if self.scheduler is not None and result is not None:
+            self.scheduler.mark_fetched(result.succeeded)
         return self.span_panel
@@ -0,0 +1,59 @@
+"""Diagnostics support for Span Panel."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import COORDINATOR, DOMAIN, FLEET
+from .coordinator import SpanPanelCoordinator
+
+TO_REDACT = {CONF_ACCESS_TOKEN, CONF_HOST, "serial"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SpanPanelCoordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    api = coordinator.span_panel.api
+    fleet = hass.data[DOMAIN].get(FLEET)
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connection": {
+            **asdict(api.connection_stats),
+            "connections_reused": api.connection_stats.connections_reused,
+        },
+        "circuit_breaker": api.circuit_breaker.as_dict(),
+        "endpoint_failures": dict(coordinator.endpoint_failures),
+        # Only retained while debug logging or retention is on; the panel is
+        # not polled for diagnostics
+        "raw_payloads": async_redact_data(api.raw_payloads.as_dict(), TO_REDACT),
+        "schema": api.schemas.as_dict(),
+        "rollups": (
+            coordinator.rollups.as_dict() if coordinator.rollups is not None else None
+        ),
+        "burst_capture": (
+            {
+                key: value
+                for key, value in coordinator.last_burst_capture.items()
+                if key != "series"
+            }
+            if coordinator.last_burst_capture is not None
+            else None
+        ),
+        "fleet": (
+            {"panels": len(fleet), **fleet.stats.as_dict()}
+            if fleet is not None
+            else None
+        ),
+    }
@@ -1,2 +1,10 @@
 class SpanPanelReturnedEmptyData(Exception):
     pass
+
+
+class SpanPanelCircuitBreakerOpen(Exception):
+    pass
+
+
+class SpanPanelDeadlineExceeded(Exception):
+    pass
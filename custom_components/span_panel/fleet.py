@@ -0,0 +1,161 @@
+"""Shared polling scheduler for several Span Panels."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import FLEET_LATENCY_SAMPLES, FLEET_MAX_CONCURRENT_REQUESTS
+from .coordinator import SpanPanelCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SpanPanelFleetStats:
+    """Fleet-wide poll counters and recent latencies."""
+
+    polls: int = 0
+    failures: int = 0
+    overruns: int = 0
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=FLEET_LATENCY_SAMPLES)
+    )
+    completed: deque[float] = field(
+        default_factory=lambda: deque(maxlen=FLEET_LATENCY_SAMPLES)
+    )
+
+    def record(self, latency: float, success: bool, now: float) -> None:
+        self.polls += 1
+        if not success:
+            self.failures += 1
+        self.latencies.append(latency)
+        self.completed.append(now)
+
+    def as_dict(self, now: float | None = None) -> dict[str, Any]:
+        now = time.monotonic() if now is None else now
+        recent = [t for t in self.completed if now - t <= 60]
+        latencies = sorted(self.latencies)
+        return {
+            "polls": self.polls,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "polls_per_minute": len(recent),
+            "latency_median": statistics.median(latencies) if latencies else None,
+            "latency_p95": (
+                latencies[int(0.95 * (len(latencies) - 1))] if latencies else None
+            ),
+            "latency_max": latencies[-1] if latencies else None,
+        }
+
+
+class SpanPanelFleet:
+    """
+    Poll every member panel from one timer. Polls are spread evenly across
+    each panel's interval, HTTP requests are capped fleet-wide on top of the
+    per-panel fetch limit, and a panel still busy with its previous poll is
+    skipped rather than queued so slow or offline panels cannot starve the
+    others.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent_requests: int = FLEET_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        self.hass = hass
+        self.request_limiter = asyncio.Semaphore(max_concurrent_requests)
+        self.stats = SpanPanelFleetStats()
+        self._members: list[SpanPanelCoordinator] = []
+        self._next_poll: dict[SpanPanelCoordinator, float] = {}
+        self._polling: dict[SpanPanelCoordinator, asyncio.Task[None]] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @callback
+    def async_add(self, coordinator: SpanPanelCoordinator) -> None:
+        """Start polling a coordinator as part of the fleet."""
+        self._members.append(coordinator)
+        self._rebalance()
+
+    @callback
+    def async_remove(self, coordinator: SpanPanelCoordinator) -> None:
+        """Stop polling a coordinator."""
+        if coordinator in self._members:
+            self._members.remove(coordinator)
+        self._next_poll.pop(coordinator, None)
+        if (task := self._polling.pop(coordinator, None)) is not None:
+            task.cancel()
+        self._rebalance()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop the fleet timer and any poll in progress."""
+        for coordinator in list(self._members):
+            self.async_remove(coordinator)
+
+    @callback
+    def _rebalance(self) -> None:
+        """Stagger members so their polls are evenly spaced."""
+        now = time.monotonic()
+        count = len(self._members)
+        for index, coordinator in enumerate(self._members):
+            self._next_poll[coordinator] = (
+                now + coordinator.poll_interval * (index + 1) / count
+            )
+        self._schedule()
+
+    @callback
+    def _schedule(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if not self._next_poll:
+            return
+        delay = max(min(self._next_poll.values()) - time.monotonic(), 0)
+        self._unsub_timer = async_call_later(self.hass, delay, self._async_dispatch)
+
+    @callback
+    def _async_dispatch(self, _now: datetime) -> None:
+        """Start every poll that is due and re-arm the timer."""
+        self._unsub_timer = None
+        now = time.monotonic()
+        for coordinator in self._members:
+            due = self._next_poll[coordinator]
+            if due > now:
+                continue
+            # Keep the slot phase, but never fire a burst to catch up
+            due += coordinator.poll_interval
+            if due <= now:
+                due = now + coordinator.poll_interval
+            self._next_poll[coordinator] = due
+            if coordinator in self._polling:
+                self.stats.overruns += 1
+                _LOGGER.debug("Skipping poll of %s, still busy", coordinator.name)
+                continue
+            self._polling[coordinator] = self.hass.async_create_background_task(
+                self._async_poll(coordinator), f"{coordinator.name} fleet poll"
+            )
+        self._schedule()
+
+    async def _async_poll(self, coordinator: SpanPanelCoordinator) -> None:
+        started = time.monotonic()
+        try:
+            await coordinator.async_refresh()
+        finally:
+            self._polling.pop(coordinator, None)
+        finished = time.monotonic()
+        self.stats.record(
+            finished - started, coordinator.last_update_success, finished
+        )
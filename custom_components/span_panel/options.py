@@ -1,12 +1,60 @@
 """Option configurations."""
 
+from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_SCAN_INTERVAL
+
+from .const import (DEFAULT_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL,
+                    ENDPOINT_BATTERY, ENDPOINT_CIRCUITS, ENDPOINT_PANEL,
+                    ENDPOINT_STATUS, ROLLUP_DEFAULT_CAPACITY)
+from .span_panel_write_policy import WritePolicy
 
 INVERTER_ENABLE = "enable_solar_circuit"
 INVERTER_LEG1 = "leg1"
 INVERTER_LEG2 = "leg2"
 INVERTER_MAXLEG = 32
 BATTERY_ENABLE = "enable_battery_percentage"
+STATUS_SCAN_INTERVAL = "status_scan_interval"
+PANEL_SCAN_INTERVAL = "panel_scan_interval"
+CIRCUITS_SCAN_INTERVAL = "circuits_scan_interval"
+BATTERY_SCAN_INTERVAL = "battery_scan_interval"
+WIRE_RECORDER_ENABLE = "enable_wire_recorder"
+FLEET_MODE_ENABLE = "enable_fleet_mode"
+BRANCH_SENSORS_ENABLE = "enable_branch_sensors"
+AGGREGATE_SENSORS_ENABLE = "enable_aggregate_sensors"
+ROLLUP_ENABLE = "enable_rollup_store"
+ROLLUP_CAPACITY = "rollup_capacity"
+POWER_DEADBAND = "power_deadband"
+POWER_RELATIVE_DEADBAND = "power_relative_deadband"
+POWER_MIN_WRITE_INTERVAL = "power_min_write_interval"
+POWER_HEARTBEAT = "power_heartbeat"
+ENERGY_DEADBAND = "energy_deadband"
+ENERGY_MIN_WRITE_INTERVAL = "energy_min_write_interval"
+ENERGY_HEARTBEAT = "energy_heartbeat"
+
+# Option holding the scan interval of each endpoint, stored only when it
+# differs from the endpoint's default
+ENDPOINT_SCAN_INTERVALS = {
+    ENDPOINT_STATUS: STATUS_SCAN_INTERVAL,
+    ENDPOINT_PANEL: PANEL_SCAN_INTERVAL,
+    ENDPOINT_CIRCUITS: CIRCUITS_SCAN_INTERVAL,
+    ENDPOINT_BATTERY: BATTERY_SCAN_INTERVAL,
+}
+
+
+def default_endpoint_intervals(scan_interval: int) -> dict[str, int]:
+    """
+    Interval of each endpoint without one of its own. Panel and circuits
+    follow the general scan interval; status and battery change rarely and
+    default to a slower cadence.
+    """
+    slow_interval = max(scan_interval, DEFAULT_SLOW_SCAN_INTERVAL.seconds)
+    return {
+        ENDPOINT_STATUS: slow_interval,
+        ENDPOINT_PANEL: scan_interval,
+        ENDPOINT_CIRCUITS: scan_interval,
+        ENDPOINT_BATTERY: slow_interval,
+    }
 
 
 class Options:
@@ -17,3 +65,43 @@ class Options:
         self.inverter_leg1: int = entry.options.get(INVERTER_LEG1, 0)
         self.inverter_leg2: int = entry.options.get(INVERTER_LEG2, 0)
         self.enable_battery_percentage: bool = entry.options.get(BATTERY_ENABLE, False)
+        self.enable_wire_recorder: bool = entry.options.get(
+            WIRE_RECORDER_ENABLE, False
+        )
+        self.enable_fleet_mode: bool = entry.options.get(FLEET_MODE_ENABLE, False)
+        self.enable_branch_sensors: bool = entry.options.get(
+            BRANCH_SENSORS_ENABLE, False
+        )
+        self.enable_aggregate_sensors: bool = entry.options.get(
+            AGGREGATE_SENSORS_ENABLE, False
+        )
+        self.enable_rollup_store: bool = entry.options.get(ROLLUP_ENABLE, False)
+        self.rollup_capacity: int = entry.options.get(
+            ROLLUP_CAPACITY, ROLLUP_DEFAULT_CAPACITY
+        )
+
+        # State write limits per sensor device class; the relative deadband
+        # is entered as a percentage
+        self.write_policies: dict[str, WritePolicy] = {
+            SensorDeviceClass.POWER: WritePolicy(
+                absolute_deadband=entry.options.get(POWER_DEADBAND, 0.0),
+                relative_deadband=entry.options.get(POWER_RELATIVE_DEADBAND, 0.0)
+                / 100,
+                min_interval=entry.options.get(POWER_MIN_WRITE_INTERVAL, 0.0),
+                heartbeat=entry.options.get(POWER_HEARTBEAT, 0.0),
+            ),
+            SensorDeviceClass.ENERGY: WritePolicy(
+                absolute_deadband=entry.options.get(ENERGY_DEADBAND, 0.0),
+                min_interval=entry.options.get(ENERGY_MIN_WRITE_INTERVAL, 0.0),
+                heartbeat=entry.options.get(ENERGY_HEARTBEAT, 0.0),
+            ),
+        }
+
+        scan_interval: int = entry.options.get(
+            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL.seconds
+        )
+        self.endpoint_intervals: dict[str, int] = {
+            endpoint: entry.options.get(ENDPOINT_SCAN_INTERVALS[endpoint], interval)
+            for endpoint, interval in default_endpoint_intervals(scan_interval).items()
+            if endpoint != ENDPOINT_BATTERY or self.enable_battery_percentage
+        }
@@ -9,8 +9,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import COORDINATOR, DOMAIN, USE_DEVICE_PREFIX, CircuitPriority
-from .coordinator import SpanPanelCoordinator
+from .const import (COORDINATOR, DOMAIN, ENDPOINT_CIRCUITS, USE_DEVICE_PREFIX,
+                    CircuitPriority)
+from .coordinator import SpanPanelCoordinator, SpanPanelListenerContext
 from .span_panel import SpanPanel
 from .util import panel_to_device_info
 
@@ -31,7 +32,12 @@ class SpanPanelCircuitsSelect(CoordinatorEntity[SpanPanelCoordinator], SelectEnt
             f"span_{span_panel.status.serial_number}_select_{self.id}"
         )
         self._attr_device_info = panel_to_device_info(span_panel)
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            context=SpanPanelListenerContext(
+                ENDPOINT_CIRCUITS, id, frozenset({"priority"})
+            ),
+        )
 
     @cached_property
     def name(self):
@@ -46,7 +52,7 @@ class SpanPanelCircuitsSelect(CoordinatorEntity[SpanPanelCoordinator], SelectEnt
     def options(self) -> list[str]:
         return [e.value for e in CircuitPriority if e != CircuitPriority.UNKNOWN]
 
-    @cached_property
+    @property
     def current_option(self) -> str | None:
         span_panel: SpanPanel = self.coordinator.data
         priority = span_panel.circuits[self.id].priority
@@ -55,9 +61,12 @@ class SpanPanelCircuitsSelect(CoordinatorEntity[SpanPanelCoordinator], SelectEnt
     async def async_select_option(self, option: str) -> None:
         span_panel: SpanPanel = self.coordinator.data
         priority = CircuitPriority(option)
-        curr_circuit = span_panel.circuits[self.id]
-        await span_panel.api.set_priority(curr_circuit, priority)
-        await self.coordinator.async_request_refresh()
+        await span_panel.set_circuit_priority(
+            self.id,
+            priority,
+            # Only the entities of the changed circuit field are notified
+            notify=self.coordinator.async_update_listeners,
+        )
 
 
 async def async_setup_entry(
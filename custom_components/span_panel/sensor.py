@@ -3,37 +3,53 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Any, Generic, List, TypeVar
+from datetime import datetime
+from typing import Any, Generic, List, TypeVar, cast
 
 from homeassistant.components.sensor import (SensorDeviceClass, SensorEntity,
                                              SensorEntityDescription,
                                              SensorStateClass)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfPower
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (CIRCUITS_ENERGY_CONSUMED, CIRCUITS_ENERGY_PRODUCED,
                     CIRCUITS_POWER, COORDINATOR, CURRENT_RUN_CONFIG, DOMAIN,
-                    DSM_GRID_STATE, DSM_STATE, MAIN_RELAY_STATE,
-                    STATUS_SOFTWARE_VER, STORAGE_BATTERY_PERCENTAGE,
-                    USE_DEVICE_PREFIX)
-from .coordinator import SpanPanelCoordinator
-from .options import BATTERY_ENABLE, INVERTER_ENABLE
+                    DSM_GRID_STATE, DSM_STATE, ENDPOINT_BATTERY,
+                    ENDPOINT_CIRCUITS, ENDPOINT_PANEL, ENDPOINT_STATUS,
+                    MAIN_RELAY_STATE, STATUS_SOFTWARE_VER,
+                    STORAGE_BATTERY_PERCENTAGE, USE_DEVICE_PREFIX,
+                    CircuitPriority)
+from .coordinator import SpanPanelCoordinator, SpanPanelListenerContext
+from .options import (AGGREGATE_SENSORS_ENABLE, BATTERY_ENABLE,
+                      BRANCH_SENSORS_ENABLE, INVERTER_ENABLE)
 from .span_panel import SpanPanel
+from .span_panel_aggregates import SpanPanelAggregates
+from .span_panel_branch_table import BranchTable
 from .span_panel_circuit import SpanPanelCircuit
+from .span_panel_circuit_table import CircuitTable
 from .span_panel_data import SpanPanelData
 from .span_panel_hardware_status import SpanPanelHardwareStatus
+from .span_panel_retry import CircuitBreakerState, SpanPanelCircuitBreaker
+from .span_panel_snapshot import SpanPanelSnapshot
 from .span_panel_storage_battery import SpanPanelStorageBattery
+from .span_panel_write_policy import StateWriteGate
 from .util import panel_to_device_info
 
 
 @dataclass(frozen=True)
 class SpanPanelCircuitsRequiredKeysMixin:
     value_fn: Callable[[SpanPanelCircuit], float]
+    # Same value read from a row of the circuit table
+    table_value_fn: Callable[[CircuitTable, int], float]
+    # Circuit field the value depends on, to skip updates when it is unchanged
+    source_field: str
 
 
 @dataclass(frozen=True)
@@ -43,6 +59,34 @@ class SpanPanelCircuitsSensorEntityDescription(
     pass
 
 
+@dataclass(frozen=True)
+class SpanPanelBranchRequiredKeysMixin:
+    # Value read from a row of the branch table
+    table_value_fn: Callable[[BranchTable, int], float]
+
+
+@dataclass(frozen=True)
+class SpanPanelBranchSensorEntityDescription(
+    SensorEntityDescription, SpanPanelBranchRequiredKeysMixin
+):
+    pass
+
+
+@dataclass(frozen=True)
+class SpanPanelAggregateRequiredKeysMixin:
+    value_fn: Callable[[SpanPanelAggregates], float | None]
+    # Circuit fields the total depends on, None when it also reads the panel
+    source_fields: frozenset[str] | None
+
+
+@dataclass(frozen=True)
+class SpanPanelAggregateSensorEntityDescription(
+    SensorEntityDescription, SpanPanelAggregateRequiredKeysMixin
+):
+    # Optional, so declared after the defaulted fields of the base description
+    attributes_fn: Callable[[SpanPanelSnapshot], dict[str, Any]] | None = None
+
+
 @dataclass(frozen=True)
 class SpanPanelDataRequiredKeysMixin:
     value_fn: Callable[[SpanPanelData], float | str]
@@ -79,6 +123,18 @@ class SpanPanelStorageBatterySensorEntityDescription(
     pass
 
 
+@dataclass(frozen=True)
+class SpanPanelCircuitBreakerRequiredKeysMixin:
+    value_fn: Callable[[SpanPanelCircuitBreaker], str]
+
+
+@dataclass(frozen=True)
+class SpanPanelCircuitBreakerSensorEntityDescription(
+    SensorEntityDescription, SpanPanelCircuitBreakerRequiredKeysMixin
+):
+    pass
+
+
 # pylint: disable=unexpected-keyword-arg
 CIRCUITS_SENSORS = (
     SpanPanelCircuitsSensorEntityDescription(
@@ -89,6 +145,8 @@ CIRCUITS_SENSORS = (
         suggested_display_precision=2,
         device_class=SensorDeviceClass.POWER,
         value_fn=lambda circuit: abs(circuit.instant_power),
+        table_value_fn=lambda table, row: abs(table.instant_power[row]),
+        source_field="instant_power",
     ),
     SpanPanelCircuitsSensorEntityDescription(
         key=CIRCUITS_ENERGY_PRODUCED,
@@ -98,6 +156,8 @@ CIRCUITS_SENSORS = (
         suggested_display_precision=2,
         device_class=SensorDeviceClass.ENERGY,
         value_fn=lambda circuit: circuit.produced_energy,
+        table_value_fn=lambda table, row: table.produced_energy[row],
+        source_field="produced_energy",
     ),
     SpanPanelCircuitsSensorEntityDescription(
         key=CIRCUITS_ENERGY_CONSUMED,
@@ -107,6 +167,169 @@ CIRCUITS_SENSORS = (
         suggested_display_precision=2,
         device_class=SensorDeviceClass.ENERGY,
         value_fn=lambda circuit: circuit.consumed_energy,
+        table_value_fn=lambda table, row: table.consumed_energy[row],
+        source_field="consumed_energy",
+    ),
+)
+
+BRANCH_SENSORS = (
+    SpanPanelBranchSensorEntityDescription(
+        key="branch_power",
+        name="Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        device_class=SensorDeviceClass.POWER,
+        table_value_fn=lambda table, row: table.instant_power[row],
+    ),
+    SpanPanelBranchSensorEntityDescription(
+        key="branch_imported_energy",
+        name="Imported Energy",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        device_class=SensorDeviceClass.ENERGY,
+        table_value_fn=lambda table, row: table.imported_energy[row],
+    ),
+    SpanPanelBranchSensorEntityDescription(
+        key="branch_exported_energy",
+        name="Exported Energy",
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=2,
+        device_class=SensorDeviceClass.ENERGY,
+        table_value_fn=lambda table, row: table.exported_energy[row],
+    ),
+)
+
+
+def top_consumer_attributes(snapshot: SpanPanelSnapshot) -> dict[str, Any]:
+    """List the largest consumers with their names."""
+    return {
+        "consumers": [
+            {
+                "circuit_id": circuit_id,
+                "name": (
+                    circuit.name
+                    if (circuit := snapshot.circuits.get(circuit_id))
+                    else circuit_id
+                ),
+                "power": power,
+            }
+            for circuit_id, power in snapshot.aggregates.top_consumers
+        ]
+    }
+
+
+AGGREGATE_SENSORS = (
+    SpanPanelAggregateSensorEntityDescription(
+        key="unmetered_power",
+        name="Unmetered Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.unmetered_power,
+        source_fields=None,
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="circuits_power",
+        name="Circuits Total Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.circuits_power,
+        source_fields=frozenset({"instant_power"}),
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="leg1_power",
+        name="Leg 1 Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.leg1_power,
+        source_fields=frozenset({"instant_power", "tabs"}),
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="leg2_power",
+        name="Leg 2 Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.leg2_power,
+        source_fields=frozenset({"instant_power", "tabs"}),
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="must_have_power",
+        name="Must Have Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.priority_power[
+            CircuitPriority.MUST_HAVE
+        ],
+        source_fields=frozenset({"instant_power", "priority"}),
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="nice_to_have_power",
+        name="Nice To Have Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.priority_power[
+            CircuitPriority.NICE_TO_HAVE
+        ],
+        source_fields=frozenset({"instant_power", "priority"}),
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="non_essential_power",
+        name="Non-Essential Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.priority_power[
+            CircuitPriority.NON_ESSENTIAL
+        ],
+        source_fields=frozenset({"instant_power", "priority"}),
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="sheddable_power",
+        name="Sheddable Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.sheddable_power,
+        source_fields=frozenset({"instant_power", "is_sheddable"}),
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="never_backup_power",
+        name="Never Backup Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: aggregates.never_backup_power,
+        source_fields=frozenset({"instant_power", "is_never_backup"}),
+    ),
+    SpanPanelAggregateSensorEntityDescription(
+        key="top_consumer_power",
+        name="Top Consumer Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda aggregates: (
+            aggregates.top_consumers[0][1] if aggregates.top_consumers else None
+        ),
+        source_fields=frozenset({"instant_power"}),
+        attributes_fn=top_consumer_attributes,
     ),
 )
 
@@ -239,6 +462,16 @@ STORAGE_BATTERY_SENSORS = (
     ),
 )
 
+CIRCUIT_BREAKER_SENSORS = (
+    SpanPanelCircuitBreakerSensorEntityDescription(
+        key="circuit_breaker_state",
+        name="API Circuit Breaker",
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in CircuitBreakerState],
+        value_fn=lambda breaker: breaker.state.value,
+    ),
+)
+
 ICON = "mdi:flash"
 _LOGGER = logging.getLogger(__name__)
 
@@ -248,16 +481,24 @@ class SpanSensorBase(CoordinatorEntity[SpanPanelCoordinator], SensorEntity, Gene
     """Base class for Span Panel Sensors."""
 
     _attr_icon = ICON
+    _endpoint: str | None
     entity_description: T
+    _write_gate: StateWriteGate | None = None
+    _unsub_heartbeat: CALLBACK_TYPE | None = None
+    _unsub_trailing_write: CALLBACK_TYPE | None = None
 
     def __init__(
         self,
         data_coordinator: SpanPanelCoordinator,
         description: T,
         span_panel: SpanPanel,
+        context: SpanPanelListenerContext | None = None,
     ) -> None:
         """Initialize Span Panel Sensor base entity."""
-        super().__init__(data_coordinator, context=description)
+        super().__init__(
+            data_coordinator,
+            context=context or SpanPanelListenerContext(self._endpoint),
+        )
         self.entity_description = description
         device_info = panel_to_device_info(span_panel)
         self._attr_device_info = device_info
@@ -276,22 +517,123 @@ class SpanSensorBase(CoordinatorEntity[SpanPanelCoordinator], SensorEntity, Gene
             f"span_{span_panel.status.serial_number}_{description.key}"
         )
 
+        if span_panel.options is not None and description.device_class is not None:
+            policy = span_panel.options.write_policies.get(description.device_class)
+            if policy:
+                self._write_gate = StateWriteGate(policy)
+
         _LOGGER.debug("CREATE SENSOR SPAN [%s]", self._attr_name)
 
+    async def async_added_to_hass(self) -> None:
+        """
+        Have the coordinator compute the value, and start the write policy
+        from the state written when added.
+        """
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_entity_value(
+                cast(str, self._attr_unique_id),
+                self.compute_value,
+                self.coordinator_context,
+            )
+        )
+        if (gate := self._write_gate) is None:
+            return
+        gate.admit(self.native_value, time.monotonic())
+        self.async_on_remove(self._async_cancel_trailing_write)
+        if gate.policy.heartbeat:
+            self._unsub_heartbeat = async_call_later(
+                self.hass, gate.policy.heartbeat, self._async_heartbeat
+            )
+            self.async_on_remove(self._async_cancel_heartbeat)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state unless the write policy holds it back."""
+        if (gate := self._write_gate) is not None:
+            now = time.monotonic()
+            if not self.available:
+                gate.reset()
+            elif not gate.admit(self.native_value, now):
+                self._async_schedule_trailing_write(
+                    gate.trailing_write_in(self.native_value, now)
+                )
+                return
+            self._async_cancel_trailing_write()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_schedule_trailing_write(self, delay: float) -> None:
+        """
+        Write the latest value once min_interval has passed, so that a
+        change held back only by it is not lost when no update follows.
+        """
+        if delay and self._unsub_trailing_write is None:
+            self._unsub_trailing_write = async_call_later(
+                self.hass, delay, self._async_trailing_write
+            )
+
+    @callback
+    def _async_trailing_write(self, _now: datetime) -> None:
+        """Write the value held back by min_interval, if still worth it."""
+        self._unsub_trailing_write = None
+        if (gate := self._write_gate) is None or not self.available:
+            return
+        now = time.monotonic()
+        if gate.admit(self.native_value, now):
+            self.async_write_ha_state()
+        else:
+            self._async_schedule_trailing_write(
+                gate.trailing_write_in(self.native_value, now)
+            )
+
+    @callback
+    def _async_cancel_trailing_write(self) -> None:
+        if self._unsub_trailing_write is not None:
+            self._unsub_trailing_write()
+            self._unsub_trailing_write = None
+
+    @callback
+    def _async_heartbeat(self, _now: datetime) -> None:
+        """Write the state if nothing was written for a heartbeat."""
+        if (gate := self._write_gate) is None:
+            return
+        now = time.monotonic()
+        if (due_in := gate.heartbeat_due_in(now)) == 0:
+            if self.available:
+                gate.admit(self.native_value, now)
+                self._async_cancel_trailing_write()
+                self.async_write_ha_state()
+            due_in = gate.policy.heartbeat
+        self._unsub_heartbeat = async_call_later(
+            self.hass, due_in, self._async_heartbeat
+        )
+
+    @callback
+    def _async_cancel_heartbeat(self) -> None:
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+
+    @property
+    def available(self) -> bool:
+        """Unavailable while the coordinator cannot compute the value."""
+        return (
+            super().available
+            and self._attr_unique_id not in self.coordinator.entity_value_errors
+        )
+
     @property
     def native_value(self) -> float | str | None:
-        """Return the state of the sensor."""
-        # Get atomic snapshot of panel data
-        span_panel: SpanPanel = self.coordinator.data
+        """Return the value computed by the coordinator for this update."""
+        return self.coordinator.entity_values.get(cast(str, self._attr_unique_id))
+
+    def compute_value(self, span_panel: SpanPanel) -> float | str | None:
+        """Compute the state of the sensor, once per coordinator update."""
         value_function = getattr(self.entity_description, "value_fn", None)
-        if value_function is not None:
-            # Get atomic snapshot of required data source
-            data_source = self.get_data_source(span_panel)
-            value = value_function(data_source)
-        else:
-            value = None
-        _LOGGER.debug("native_value:[%s] [%s]", self._attr_name, value)
-        return value
+        if value_function is None:
+            return None
+        return value_function(self.get_data_source(span_panel))
 
     def get_data_source(self, span_panel: SpanPanel) -> Any:
         """Get the data source for the sensor."""
@@ -301,6 +643,8 @@ class SpanSensorBase(CoordinatorEntity[SpanPanelCoordinator], SensorEntity, Gene
 class SpanPanelCircuitSensor(SpanSensorBase[SpanPanelCircuitsSensorEntityDescription]):
     """Initialize SpanPanelCircuitSensor"""
 
+    _endpoint = ENDPOINT_CIRCUITS
+
     def __init__(
         self,
         coordinator: SpanPanelCoordinator,
@@ -317,19 +661,112 @@ class SpanPanelCircuitSensor(SpanSensorBase[SpanPanelCircuitsSensorEntityDescrip
                 "name": f"{name} {description.name}"
             }
         )
-        super().__init__(coordinator, circuit_description, span_panel)
+        super().__init__(
+            coordinator,
+            circuit_description,
+            span_panel,
+            SpanPanelListenerContext(
+                ENDPOINT_CIRCUITS, circuit_id, frozenset({description.source_field})
+            ),
+        )
         self.id = circuit_id
         self._attr_unique_id = (
             f"span_{span_panel.status.serial_number}_{circuit_id}_{description.key}"
         )
 
+    def compute_value(self, span_panel: SpanPanel) -> float | None:
+        """Compute the state of the sensor from its row of the circuit table."""
+        table = span_panel.circuit_table
+        if (row := table.row(self.id)) is None:
+            return None
+        return self.entity_description.table_value_fn(table, row)
+
     def get_data_source(self, span_panel: SpanPanel) -> SpanPanelCircuit:
         return span_panel.circuits[self.id]
 
 
+class SpanPanelBranchSensor(SpanSensorBase[SpanPanelBranchSensorEntityDescription]):
+    """Initialize SpanPanelBranchSensor"""
+
+    _endpoint = ENDPOINT_PANEL
+
+    def __init__(
+        self,
+        coordinator: SpanPanelCoordinator,
+        description: SpanPanelBranchSensorEntityDescription,
+        branch_id: int,
+        span_panel: SpanPanel,
+    ) -> None:
+        """Initialize Span Panel Branch entity."""
+        branch_description = SpanPanelBranchSensorEntityDescription(
+            **{
+                **vars(description),
+                "name": f"Branch {branch_id} {description.name}"
+            }
+        )
+        super().__init__(
+            coordinator,
+            branch_description,
+            span_panel,
+            SpanPanelListenerContext(ENDPOINT_PANEL, fields=frozenset({"branches"})),
+        )
+        self.branch_id = branch_id
+        self._attr_unique_id = (
+            f"span_{span_panel.status.serial_number}_branch_{branch_id}_{description.key}"
+        )
+
+    def compute_value(self, span_panel: SpanPanel) -> float | None:
+        """Compute the state of the sensor from its row of the branch table."""
+        branches = span_panel.panel.branches
+        if (row := branches.row(self.branch_id)) is None:
+            return None
+        return self.entity_description.table_value_fn(branches, row)
+
+    def get_data_source(self, span_panel: SpanPanel) -> BranchTable:
+        return span_panel.panel.branches
+
+
+class SpanPanelAggregateSensor(
+    SpanSensorBase[SpanPanelAggregateSensorEntityDescription]
+):
+    """Initialize SpanPanelAggregateSensor"""
+
+    _attr_icon = "mdi:sigma"
+    _endpoint = ENDPOINT_CIRCUITS
+
+    def __init__(
+        self,
+        coordinator: SpanPanelCoordinator,
+        description: SpanPanelAggregateSensorEntityDescription,
+        span_panel: SpanPanel,
+    ) -> None:
+        """Initialize Span Panel Aggregate entity."""
+        super().__init__(
+            coordinator,
+            description,
+            span_panel,
+            SpanPanelListenerContext(
+                None if description.source_fields is None else ENDPOINT_CIRCUITS,
+                fields=description.source_fields,
+            ),
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if (attributes_fn := self.entity_description.attributes_fn) is None:
+            return None
+        span_panel: SpanPanel = self.coordinator.data
+        return attributes_fn(span_panel.snapshot)
+
+    def get_data_source(self, span_panel: SpanPanel) -> SpanPanelAggregates:
+        return span_panel.snapshot.aggregates
+
+
 class SpanPanelPanel(SpanSensorBase[SpanPanelDataSensorEntityDescription]):
     """Initialize SpanPanelPanel"""
 
+    _endpoint = ENDPOINT_PANEL
+
     def get_data_source(self, span_panel: SpanPanel) -> SpanPanelData:
         return span_panel.panel
 
@@ -337,6 +774,8 @@ class SpanPanelPanel(SpanSensorBase[SpanPanelDataSensorEntityDescription]):
 class SpanPanelPanelStatus(SpanSensorBase[SpanPanelDataSensorEntityDescription]):
     """Initialize SpanPanelPanelStatus"""
 
+    _endpoint = ENDPOINT_PANEL
+
     def get_data_source(self, span_panel: SpanPanel) -> SpanPanelData:
         return span_panel.panel
 
@@ -344,6 +783,8 @@ class SpanPanelPanelStatus(SpanSensorBase[SpanPanelDataSensorEntityDescription])
 class SpanPanelStatus(SpanSensorBase[SpanPanelStatusSensorEntityDescription]):
     """Initialize SpanPanelStatus"""
 
+    _endpoint = ENDPOINT_STATUS
+
     def get_data_source(self, span_panel: SpanPanel) -> SpanPanelHardwareStatus:
         return span_panel.status
 
@@ -352,11 +793,34 @@ class SpanPanelStorageBatteryStatus(SpanSensorBase[SpanPanelStorageBatterySensor
     """Initialize SpanPanelStorageBatteryStatus"""
 
     _attr_icon = "mdi:battery"
+    _endpoint = ENDPOINT_BATTERY
 
     def get_data_source(self, span_panel: SpanPanel) -> SpanPanelStorageBattery:
         return span_panel.storage_battery
 
 
+class SpanPanelCircuitBreakerStatus(
+    SpanSensorBase[SpanPanelCircuitBreakerSensorEntityDescription]
+):
+    """Initialize SpanPanelCircuitBreakerStatus"""
+
+    _attr_icon = "mdi:lan-disconnect"
+    # Not tied to an endpoint, updated after every poll including failed ones
+    _endpoint = None
+
+    @property
+    def available(self) -> bool:
+        """Stay available so an open breaker is visible while polling fails."""
+        return True
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self.coordinator.span_panel.api.circuit_breaker.as_dict()
+
+    def get_data_source(self, span_panel: SpanPanel) -> SpanPanelCircuitBreaker:
+        return span_panel.api.circuit_breaker
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -379,6 +843,21 @@ async def async_setup_entry(
         for description_i in INVERTER_SENSORS:
             entities.append(SpanPanelPanelStatus(coordinator, description_i, span_panel))
 
+    if config_entry.options.get(BRANCH_SENSORS_ENABLE, False):
+        for description_br in BRANCH_SENSORS:
+            for branch_id in span_panel.panel.branches.ids:
+                entities.append(
+                    SpanPanelBranchSensor(
+                        coordinator, description_br, branch_id, span_panel
+                    )
+                )
+
+    if config_entry.options.get(AGGREGATE_SENSORS_ENABLE, False):
+        for description_ag in AGGREGATE_SENSORS:
+            entities.append(
+                SpanPanelAggregateSensor(coordinator, description_ag, span_panel)
+            )
+
     for description_ss in STATUS_SENSORS:
         entities.append(SpanPanelStatus(coordinator, description_ss, span_panel))
 
@@ -389,6 +868,11 @@ async def async_setup_entry(
                     coordinator, description_cs, id_c, circuit_data.name, span_panel
                 )
             )
+    for description_cb in CIRCUIT_BREAKER_SENSORS:
+        entities.append(
+            SpanPanelCircuitBreakerStatus(coordinator, description_cb, span_panel)
+        )
+
     if config_entry.options.get(BATTERY_ENABLE, False):
         for description_sb in STORAGE_BATTERY_SENSORS:
             entities.append(
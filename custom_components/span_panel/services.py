@@ -0,0 +1,305 @@
+"""Services for Span Panel."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (HomeAssistant, ServiceCall, ServiceResponse,
+                                SupportsResponse, callback)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonValueType
+
+from .const import (BURST_DEFAULT_DURATION, BURST_DEFAULT_INTERVAL,
+                    BURST_MAX_DURATION, BURST_MIN_INTERVAL, COORDINATOR,
+                    DOMAIN, ENDPOINT_CIRCUITS, EVENT_BURST_CAPTURE,
+                    PANEL_POWER_READINGS, ROLLUP_RESOLUTIONS,
+                    SERVICE_QUERY_ROLLUPS, SERVICE_SET_CIRCUITS,
+                    SERVICE_START_BURST_CAPTURE, CircuitPriority,
+                    CircuitRelayState)
+from .coordinator import SpanPanelCoordinator
+from .span_panel_burst import BURST_ENDPOINTS, SpanPanelBurstCapture
+from .span_panel_rollup import circuit_series, panel_series
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CIRCUITS = "circuits"
+ATTR_RELAY_STATE = "relay_state"
+ATTR_PRIORITY = "priority"
+ATTR_DURATION = "duration"
+ATTR_INTERVAL = "interval"
+ATTR_ENDPOINTS = "endpoints"
+ATTR_DUMP = "dump"
+ATTR_RESOLUTION = "resolution"
+ATTR_METRICS = "metrics"
+ATTR_START = "start"
+ATTR_END = "end"
+
+SET_CIRCUITS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Required(ATTR_CIRCUITS): vol.All(
+                cv.ensure_list, [vol.Any(int, cv.string)], vol.Length(min=1)
+            ),
+            vol.Optional(ATTR_RELAY_STATE): vol.In(
+                [CircuitRelayState.OPEN.name, CircuitRelayState.CLOSED.name]
+            ),
+            vol.Optional(ATTR_PRIORITY): vol.In(
+                [p.name for p in CircuitPriority if p != CircuitPriority.UNKNOWN]
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_RELAY_STATE, ATTR_PRIORITY),
+)
+
+START_BURST_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=BURST_DEFAULT_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=BURST_MAX_DURATION)
+        ),
+        vol.Optional(ATTR_INTERVAL, default=BURST_DEFAULT_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=BURST_MIN_INTERVAL, max=60)
+        ),
+        vol.Optional(ATTR_ENDPOINTS, default=[ENDPOINT_CIRCUITS]): vol.All(
+            cv.ensure_list, [vol.In(BURST_ENDPOINTS)], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_CIRCUITS): vol.All(
+            cv.ensure_list, [vol.Any(int, cv.string)], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_DUMP, default=False): cv.boolean,
+    }
+)
+
+# Shared by the service and the websocket command
+QUERY_ROLLUPS_FIELDS: dict[str | vol.Marker, Any] = {
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_RESOLUTION, default="1m"): vol.In(list(ROLLUP_RESOLUTIONS)),
+    vol.Optional(ATTR_CIRCUITS): vol.All(
+        cv.ensure_list, [vol.Any(int, cv.string)], vol.Length(min=1)
+    ),
+    vol.Optional(ATTR_METRICS): vol.All(
+        cv.ensure_list, [vol.In(PANEL_POWER_READINGS)], vol.Length(min=1)
+    ),
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+}
+
+QUERY_ROLLUPS_SCHEMA = vol.Schema(QUERY_ROLLUPS_FIELDS)
+
+
+def resolve_entry_id(hass: HomeAssistant, entry_id: str | None) -> str:
+    """Return the id of a loaded config entry, the only one when None."""
+    entries = {
+        entry.entry_id: entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    }
+    if entry_id is None:
+        if len(entries) != 1:
+            raise ServiceValidationError(
+                f"{ATTR_CONFIG_ENTRY_ID} is required with several panels configured"
+            )
+        entry_id = next(iter(entries))
+    if entry_id not in entries:
+        raise ServiceValidationError(f"Span Panel {entry_id} is not loaded")
+    return entry_id
+
+
+def get_entry_id(hass: HomeAssistant, call: ServiceCall) -> str:
+    """Return the id of the loaded config entry targeted by a service call."""
+    return resolve_entry_id(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+
+
+def get_coordinator(hass: HomeAssistant, call: ServiceCall) -> SpanPanelCoordinator:
+    """Return the coordinator of the panel targeted by a service call."""
+    return hass.data[DOMAIN][get_entry_id(hass, call)][COORDINATOR]
+
+
+async def async_set_circuits(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Set the relay state and/or priority of several circuits at once."""
+    coordinator = get_coordinator(hass, call)
+    span_panel = coordinator.span_panel
+
+    results: dict[str, JsonValueType] = {}
+    failed: list[str] = []
+    resolved: dict[str, str] = {}
+    for ref in call.data[ATTR_CIRCUITS]:
+        circuit_id = span_panel.resolve_circuit(ref)
+        if circuit_id is None:
+            results[str(ref)] = {
+                "circuit_id": None,
+                "success": False,
+                "error": "unknown circuit",
+            }
+            failed.append(str(ref))
+        else:
+            resolved[str(ref)] = circuit_id
+
+    relay_state = call.data.get(ATTR_RELAY_STATE)
+    priority = call.data.get(ATTR_PRIORITY)
+    outcome = await span_panel.set_circuits(
+        resolved.values(),
+        relay_state=CircuitRelayState[relay_state] if relay_state else None,
+        priority=CircuitPriority[priority] if priority else None,
+    )
+    for ref, circuit_id in resolved.items():
+        error = outcome[circuit_id]
+        results[ref] = {
+            "circuit_id": circuit_id,
+            "success": error is None,
+            "error": str(error) if error is not None else None,
+        }
+        if error is not None:
+            failed.append(ref)
+
+    if failed:
+        _LOGGER.warning("set_circuits failed for: %s", ", ".join(failed))
+
+    # One refresh for the whole batch instead of one per circuit
+    await coordinator.async_request_endpoint_refresh(ENDPOINT_CIRCUITS)
+    return {"results": results}
+
+
+async def async_start_burst_capture(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """
+    Sample the panel at a high rate for a while, then publish statistics of
+    every sampled reading. The summary is fired as an event once the
+    capture ends; a call with a response waits for it and returns it.
+    """
+    entry_id = get_entry_id(hass, call)
+    coordinator: SpanPanelCoordinator = hass.data[DOMAIN][entry_id][COORDINATOR]
+    if coordinator.burst_task is not None and not coordinator.burst_task.done():
+        raise ServiceValidationError("A burst capture is already running")
+
+    span_panel = coordinator.span_panel
+    circuit_ids: list[str] = []
+    for ref in call.data.get(ATTR_CIRCUITS, ()):
+        circuit_id = span_panel.resolve_circuit(ref)
+        if circuit_id is None:
+            raise ServiceValidationError(f"Unknown circuit: {ref}")
+        circuit_ids.append(circuit_id)
+
+    capture = SpanPanelBurstCapture(
+        api=span_panel.api,
+        duration=call.data[ATTR_DURATION],
+        interval=call.data[ATTR_INTERVAL],
+        endpoints=frozenset(call.data[ATTR_ENDPOINTS]),
+        circuit_ids=frozenset(circuit_ids),
+        circuit_names={
+            circuit_id: circuit.name
+            for circuit_id, circuit in span_panel.circuits.items()
+        },
+    )
+
+    async def run() -> dict[str, Any]:
+        await capture.run()
+        summary = capture.summary()
+        summary["file"] = None
+        if call.data[ATTR_DUMP] and capture.buffer.count:
+            path = Path(
+                hass.config.path(
+                    DOMAIN, f"{entry_id}.burst.{int(capture.started_at or 0)}.csv.gz"
+                )
+            )
+            summary["file"] = str(await hass.async_add_executor_job(capture.dump, path))
+        coordinator.last_burst_capture = summary
+        hass.bus.async_fire(
+            EVENT_BURST_CAPTURE, {ATTR_CONFIG_ENTRY_ID: entry_id, **summary}
+        )
+        return summary
+
+    task = coordinator.burst_task = hass.async_create_background_task(
+        run(), f"{DOMAIN} burst capture {entry_id}"
+    )
+    if not call.return_response:
+        return None
+    # Shielded so that a cancelled call leaves the capture running
+    return await asyncio.shield(task)
+
+
+def query_rollups(
+    coordinator: SpanPanelCoordinator, data: Mapping[str, Any]
+) -> dict[str, Any]:
+    """
+    Return a window of the in-memory rollups of a panel. Without circuits
+    or metrics every stored series is returned.
+    """
+    if coordinator.rollups is None:
+        raise ServiceValidationError(
+            "The in-memory power history is disabled in the options"
+        )
+    span_panel = coordinator.span_panel
+    names: dict[str, str] = {}
+    for ref in data.get(ATTR_CIRCUITS, ()):
+        circuit_id = span_panel.resolve_circuit(ref)
+        if circuit_id is None:
+            raise ServiceValidationError(f"Unknown circuit: {ref}")
+        names[circuit_series(circuit_id)] = span_panel.circuits[circuit_id].name
+    for metric in data.get(ATTR_METRICS, ()):
+        names[panel_series(metric)] = metric
+    start = data.get(ATTR_START)
+    end = data.get(ATTR_END)
+    result = coordinator.rollups.query(
+        data[ATTR_RESOLUTION],
+        series=names or None,
+        start=dt_util.as_utc(start).timestamp() if start is not None else None,
+        end=dt_util.as_utc(end).timestamp() if end is not None else None,
+    )
+    if not names:
+        names = {
+            circuit_series(circuit_id): circuit.name
+            for circuit_id, circuit in span_panel.circuits.items()
+        }
+    result["names"] = {
+        series: names.get(series, series.partition(".")[2])
+        for series in result["series"]
+    }
+    return result
+
+
+async def async_query_rollups(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Return a window of the in-memory power history of a panel."""
+    return query_rollups(get_coordinator(hass, call), call.data)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Span Panel services, shared by every config entry."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_CIRCUITS,
+        partial(async_set_circuits, hass),
+        schema=SET_CIRCUITS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_BURST_CAPTURE,
+        partial(async_start_burst_capture, hass),
+        schema=START_BURST_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_ROLLUPS,
+        partial(async_query_rollups, hass),
+        schema=QUERY_ROLLUPS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
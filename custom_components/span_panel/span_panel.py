@@ -1,18 +1,31 @@
 """Module to read production and consumption values from a Span panel."""
 
+import asyncio
 import logging
-from copy import deepcopy
-from typing import Dict
+from collections.abc import Awaitable, Callable, Collection, Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict
 
 from homeassistant.helpers.httpx_client import httpx
 
-from .exceptions import SpanPanelReturnedEmptyData
+from .const import (API_FRESHNESS_WINDOW, CIRCUIT_CONTROL_MAX_CONCURRENCY,
+                    ENDPOINT_BATTERY, ENDPOINT_CIRCUITS, ENDPOINT_PANEL,
+                    ENDPOINT_STATUS, LOW_PRIORITY_ENDPOINTS,
+                    PANEL_MAX_CONCURRENT_FETCHES, CircuitPriority,
+                    CircuitRelayState)
+from .exceptions import SpanPanelCircuitBreakerOpen, SpanPanelReturnedEmptyData
 from .options import Options
-from .span_panel_api import SpanPanelApi
+from .span_panel_api import SPAN_PANEL_API_ERRORS, SpanPanelApi
 from .span_panel_circuit import SpanPanelCircuit
+from .span_panel_circuit_table import CircuitTable
 from .span_panel_data import SpanPanelData
+from .span_panel_deadline import SpanPanelDeadline
 from .span_panel_hardware_status import SpanPanelHardwareStatus
+from .span_panel_recorder import SpanPanelWireRecorder
+from .span_panel_snapshot import SpanPanelSnapshot
 from .span_panel_storage_battery import SpanPanelStorageBattery
+from .span_panel_stream import (CircuitRelayEvent, PanelMeterEvent,
+                                SpanPanelEvent)
 
 STATUS_URL = "http://{}/api/v1/status"
 SPACES_URL = "http://{}/api/v1/spaces"
@@ -33,6 +46,22 @@ SYSTEM_ETHERNET_LINK = "eth0Link"
 SYSTEM_CELLULAR_LINK = "wwanLink"
 SYSTEM_WIFI_LINK = "wlanLink"
 
+_SKIPPED = object()
+
+
+@dataclass
+class SpanPanelUpdateResult:
+    """Outcome of a panel update, per endpoint."""
+
+    succeeded: set[str] = field(default_factory=set)
+    failed: dict[str, Exception] = field(default_factory=dict)
+    # Low-priority endpoints left for the next cycle because time ran short
+    skipped: set[str] = field(default_factory=set)
+
+    @property
+    def is_partial(self) -> bool:
+        return bool(self.succeeded) and bool(self.failed)
+
 
 class SpanPanel:
     """Class to manage the Span Panel."""
@@ -43,32 +72,51 @@ class SpanPanel:
         access_token: str | None = None,    # nosec
         options: Options | None = None,
         async_client: httpx.AsyncClient | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_concurrent_fetches: int = PANEL_MAX_CONCURRENT_FETCHES,
+        recorder: SpanPanelWireRecorder | None = None,
+        request_limiter: asyncio.Semaphore | None = None,
     ) -> None:
         """Initialize the Span Panel."""
         self._options = options
-        self.api = SpanPanelApi(host, access_token, options, async_client)
-        self._status: SpanPanelHardwareStatus | None = None
-        self._panel: SpanPanelData | None = None
-        self._circuits: Dict[str, SpanPanelCircuit] = {}
-        self._storage_battery: SpanPanelStorageBattery | None = None
+        self.api = SpanPanelApi(
+            host,
+            access_token,
+            options,
+            async_client,
+            transport=transport,
+            recorder=recorder,
+            freshness_window=API_FRESHNESS_WINDOW,
+            request_limiter=request_limiter,
+        )
+        self._fetch_semaphore = asyncio.Semaphore(max_concurrent_fetches)
+        self._snapshot = SpanPanelSnapshot()
+        # Lookup of circuit ids by casefolded name and by breaker tab
+        self._circuit_names: Dict[str, str] = {}
+        self._circuit_tabs: Dict[int, str] = {}
+        self.last_update_result: SpanPanelUpdateResult | None = None
 
     def _get_hardware_status(self) -> SpanPanelHardwareStatus:
         """Get hardware status with type checking."""
-        if self._status is None:
+        if (status := self._snapshot.status) is None:
             raise RuntimeError("Hardware status not available")
-        return deepcopy(self._status)
+        return status
 
     def _get_data(self) -> SpanPanelData:
         """Get data with type checking."""
-        if self._panel is None:
-            raise RuntimeError("Panel data not available") 
-        return deepcopy(self._panel)
+        if (panel := self._snapshot.panel) is None:
+            raise RuntimeError("Panel data not available")
+        return panel
 
     def _get_storage_battery(self) -> SpanPanelStorageBattery:
         """Get storage battery with type checking."""
-        if self._storage_battery is None:
+        if (storage_battery := self._snapshot.storage_battery) is None:
             raise RuntimeError("Storage battery not available")
-        return deepcopy(self._storage_battery)
+        return storage_battery
+
+    async def close(self) -> None:
+        """Release the panel's HTTP session."""
+        await self.api.close()
 
     @property
     def host(self) -> str:
@@ -78,53 +126,327 @@ class SpanPanel:
     @property
     def options(self) -> Options | None:
         """Get options data atomically"""
-        return deepcopy(self._options) if self._options else None
+        return self._options
 
+    # Every change publishes a new snapshot generation. The models are frozen
+    # and built fresh from each response, so they are shared, never copied.
     def _update_status(self, new_status: SpanPanelHardwareStatus) -> None:
         """Atomic update of status data"""
-        self._status = deepcopy(new_status)
+        self._snapshot = self._snapshot.evolve(status=new_status)
 
     def _update_panel(self, new_panel: SpanPanelData) -> None:
         """Atomic update of panel data"""
-        self._panel = deepcopy(new_panel)
+        self._snapshot = self._snapshot.evolve(panel=new_panel)
 
     def _update_circuits(self, new_circuits: Dict[str, SpanPanelCircuit]) -> None:
         """Atomic update of circuits data"""
-        self._circuits = deepcopy(new_circuits)
+        self._snapshot = self._snapshot.evolve(circuits=new_circuits)
+        self._circuit_names = {
+            circuit.name.casefold(): circuit_id
+            for circuit_id, circuit in new_circuits.items()
+        }
+        self._circuit_tabs = {
+            tab: circuit_id
+            for circuit_id, circuit in new_circuits.items()
+            for tab in circuit.tabs
+        }
 
-    def _update_storage_battery(self, new_battery: SpanPanelStorageBattery) -> None:
-        """Atomic update of storage battery data"""
-        self._storage_battery = deepcopy(new_battery)
+    def resolve_circuit(self, ref: str | int) -> str | None:
+        """Resolve a circuit id, name or breaker tab to a circuit id."""
+        if isinstance(ref, int):
+            return self._circuit_tabs.get(ref)
+        if ref in self._snapshot.circuits:
+            return ref
+        if (circuit_id := self._circuit_names.get(ref.casefold())) is not None:
+            return circuit_id
+        if ref.isdigit():
+            return self._circuit_tabs.get(int(ref))
+        return None
+
+    async def set_circuits(
+        self,
+        circuit_ids: Collection[str],
+        relay_state: CircuitRelayState | None = None,
+        priority: CircuitPriority | None = None,
+        max_concurrency: int = CIRCUIT_CONTROL_MAX_CONCURRENCY,
+    ) -> Dict[str, Exception | None]:
+        """
+        Apply a relay state and/or priority to several circuits, issuing at
+        most max_concurrency POSTs at a time. Returns the error per circuit,
+        None when it succeeded. No refresh is done here.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def apply(circuit_id: str) -> None:
+            circuit = self._snapshot.circuits[circuit_id]
+            if not circuit.is_user_controllable:
+                raise ValueError(f"Circuit {circuit.name} is not user controllable")
+            async with semaphore:
+                if relay_state is not None:
+                    await self.api.set_relay(circuit, relay_state)
+                if priority is not None:
+                    await self.api.set_priority(circuit, priority)
+
+        ids = list(dict.fromkeys(circuit_ids))
+        results = await asyncio.gather(
+            *(apply(circuit_id) for circuit_id in ids), return_exceptions=True
+        )
+        outcome: Dict[str, Exception | None] = {}
+        for circuit_id, result in zip(ids, results):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+            outcome[circuit_id] = result if isinstance(result, Exception) else None
+        return outcome
+
+    def _replace_circuit(self, circuit: SpanPanelCircuit) -> None:
+        """Publish a single changed circuit without mutating the old mapping."""
+        circuits = dict(self._snapshot.circuits)
+        circuits[circuit.circuit_id] = circuit
+        self._snapshot = self._snapshot.evolve(
+            circuits=circuits,
+            circuit_table=self._snapshot.circuit_table.replace_circuit(circuit),
+        )
+
+    async def _command_circuit(
+        self,
+        circuit_id: str,
+        optimistic: SpanPanelCircuit,
+        send: Callable[[SpanPanelCircuit], Awaitable[None]],
+        confirmed: Callable[[SpanPanelCircuit], bool],
+        notify: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Apply a circuit command optimistically, send it, then confirm it with a
+        fetch of that one circuit. The previous state is restored if the POST
+        fails, and the panel's state is published if it disagrees.
+        """
+        previous = self._snapshot.circuits[circuit_id]
+        self._replace_circuit(optimistic)
+        if notify is not None:
+            notify()
 
-    async def update(self) -> None:
-        """Update all panel data atomically"""
         try:
-            _LOGGER.debug("Starting panel update")
-            # Get new data
-            new_status = await self.api.get_status_data()
-            _LOGGER.debug("Got status data: %s", new_status)
-            new_panel = await self.api.get_panel_data()
-            _LOGGER.debug("Got panel data: %s", new_panel)
-            new_circuits = await self.api.get_circuits_data()
-            _LOGGER.debug("Got circuits data: %s", new_circuits)
-            
-            # Atomic updates
-            self._update_status(new_status)
-            self._update_panel(new_panel)
-            self._update_circuits(new_circuits)
-
-            if self._options and self._options.enable_battery_percentage:
-                new_battery = await self.api.get_storage_battery_data()
-                _LOGGER.debug("Got battery data: %s", new_battery)
-                self._update_storage_battery(new_battery)
-
-            _LOGGER.debug("Panel update completed successfully")
-        except SpanPanelReturnedEmptyData:
-            _LOGGER.warning("Span Panel returned empty data")
-        except Exception as err:
-            _LOGGER.error("Error updating panel: %s", err, exc_info=True)
+            await send(previous)
+        except Exception:
+            if self._snapshot.circuits.get(circuit_id) is optimistic:
+                self._replace_circuit(previous)
+                if notify is not None:
+                    notify()
             raise
 
+        try:
+            actual = await self.api.get_circuit_data(circuit_id)
+        except SPAN_PANEL_API_ERRORS as err:
+            # Keep the optimistic state, the next poll reconciles it
+            _LOGGER.debug("Could not confirm circuit %s: %s", circuit_id, err)
+            return
+        if not confirmed(actual):
+            _LOGGER.warning(
+                "Span Panel did not apply the command to circuit %s, reverting",
+                actual.name,
+            )
+        self._replace_circuit(actual)
+        if notify is not None:
+            notify()
+
+    async def set_circuit_relay(
+        self,
+        circuit_id: str,
+        state: CircuitRelayState,
+        notify: Callable[[], None] | None = None,
+    ) -> None:
+        """Set a circuit relay with optimistic state and targeted confirmation."""
+        await self._command_circuit(
+            circuit_id,
+            replace(self._snapshot.circuits[circuit_id], relay_state=state.name),
+            lambda circuit: self.api.set_relay(circuit, state),
+            lambda actual: actual.relay_state == state.name,
+            notify,
+        )
+
+    async def set_circuit_priority(
+        self,
+        circuit_id: str,
+        priority: CircuitPriority,
+        notify: Callable[[], None] | None = None,
+    ) -> None:
+        """Set a circuit priority with optimistic state and targeted confirmation."""
+        await self._command_circuit(
+            circuit_id,
+            replace(self._snapshot.circuits[circuit_id], priority=priority.name),
+            lambda circuit: self.api.set_priority(circuit, priority),
+            lambda actual: actual.priority == priority.name,
+            notify,
+        )
+
+    def apply_event(self, event: SpanPanelEvent) -> str | None:
+        """
+        Apply an incremental update from a stream to the current snapshot.
+        Returns the endpoint whose data changed, or None if the event did not
+        match anything published yet.
+        """
+        if isinstance(event, PanelMeterEvent):
+            if (panel := self._snapshot.panel) is None:
+                return None
+            changes: Dict[str, Any] = {"instant_grid_power": event.instant_grid_power}
+            if event.main_meter_energy_produced is not None:
+                changes["main_meter_energy_produced"] = event.main_meter_energy_produced
+            if event.main_meter_energy_consumed is not None:
+                changes["main_meter_energy_consumed"] = event.main_meter_energy_consumed
+            if event.feedthrough_power is not None:
+                changes["feedthrough_power"] = event.feedthrough_power
+            self._snapshot = self._snapshot.evolve(panel=replace(panel, **changes))
+            return ENDPOINT_PANEL
+
+        circuit = self._snapshot.circuits.get(event.circuit_id)
+        if circuit is None:
+            return None
+        if isinstance(event, CircuitRelayEvent):
+            self._replace_circuit(replace(circuit, relay_state=event.relay_state))
+        else:
+            changes = {"instant_power": event.instant_power}
+            if event.produced_energy is not None:
+                changes["produced_energy"] = event.produced_energy
+            if event.consumed_energy is not None:
+                changes["consumed_energy"] = event.consumed_energy
+            self._replace_circuit(replace(circuit, **changes))
+        return ENDPOINT_CIRCUITS
+
+    def _update_storage_battery(self, new_battery: SpanPanelStorageBattery) -> None:
+        """Atomic update of storage battery data"""
+        self._snapshot = self._snapshot.evolve(storage_battery=new_battery)
+
+    def _has_data(self, endpoint: str) -> bool:
+        """Return True if data for the endpoint has been published before."""
+        snapshot = self._snapshot
+        published: dict[str, bool] = {
+            ENDPOINT_STATUS: snapshot.status is not None,
+            ENDPOINT_PANEL: snapshot.panel is not None,
+            ENDPOINT_CIRCUITS: bool(snapshot.circuits),
+            ENDPOINT_BATTERY: snapshot.storage_battery is not None,
+        }
+        return published.get(endpoint, False)
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        fetcher: Callable[[SpanPanelDeadline | None], Awaitable[Any]],
+        deadline: SpanPanelDeadline | None,
+    ) -> Any:
+        """Fetch a single endpoint within the concurrency bound."""
+        async with self._fetch_semaphore:
+            if (
+                deadline is not None
+                and deadline.nearly_expired
+                and endpoint in LOW_PRIORITY_ENDPOINTS
+                and self._has_data(endpoint)
+            ):
+                _LOGGER.debug("Skipping %s, update budget nearly used", endpoint)
+                return _SKIPPED
+            result = await fetcher(deadline)
+        _LOGGER.debug("Got %s data: %s", endpoint, result)
+        return result
+
+    async def update(
+        self,
+        endpoints: Collection[str] | None = None,
+        deadline: SpanPanelDeadline | None = None,
+    ) -> SpanPanelUpdateResult:
+        """
+        Fetch endpoints concurrently and publish each one independently.
+
+        Only the given endpoints are fetched; all of them when None. Every
+        request shares the deadline, and low-priority endpoints are skipped
+        when it is nearly reached.
+
+        An endpoint that fails keeps its previously published data. The
+        update only raises when authentication fails, when every endpoint
+        failed, or when an endpoint without prior data failed.
+        """
+        _LOGGER.debug("Starting panel update")
+        self.last_update_result = None
+        fetchers: dict[str, Callable[[SpanPanelDeadline | None], Awaitable[Any]]] = {
+            ENDPOINT_STATUS: self.api.get_status_data,
+            ENDPOINT_PANEL: self.api.get_panel_data,
+            ENDPOINT_CIRCUITS: self.api.get_circuits_data,
+        }
+        if self._options and self._options.enable_battery_percentage:
+            fetchers[ENDPOINT_BATTERY] = self.api.get_storage_battery_data
+        if endpoints is not None:
+            fetchers = {
+                name: fetcher
+                for name, fetcher in fetchers.items()
+                if name in endpoints
+            }
+
+        results = await asyncio.gather(
+            *(
+                self._fetch(name, fetcher, deadline)
+                for name, fetcher in fetchers.items()
+            ),
+            return_exceptions=True,
+        )
+
+        update_result = SpanPanelUpdateResult()
+        appliers: dict[str, Callable[[Any], None]] = {
+            ENDPOINT_STATUS: self._update_status,
+            ENDPOINT_PANEL: self._update_panel,
+            ENDPOINT_CIRCUITS: self._update_circuits,
+            ENDPOINT_BATTERY: self._update_storage_battery,
+        }
+        for endpoint, result in zip(fetchers, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                update_result.failed[endpoint] = result
+            elif result is _SKIPPED:
+                update_result.skipped.add(endpoint)
+            else:
+                appliers[endpoint](result)
+                update_result.succeeded.add(endpoint)
+
+        self.last_update_result = update_result
+        self._raise_for_failures(update_result)
+        _LOGGER.debug("Panel update completed: %s", update_result)
+        return update_result
+
+    def _raise_for_failures(self, update_result: SpanPanelUpdateResult) -> None:
+        """Decide whether the failed endpoints invalidate the whole update."""
+        fatal: Exception | None = None
+        for endpoint, err in update_result.failed.items():
+            if (
+                isinstance(err, SpanPanelCircuitBreakerOpen)
+                and not update_result.succeeded
+            ):
+                raise err
+            if (
+                isinstance(err, httpx.HTTPStatusError)
+                and err.response.status_code == httpx.codes.UNAUTHORIZED
+            ):
+                raise err
+            if isinstance(err, SpanPanelReturnedEmptyData):
+                _LOGGER.warning("Span Panel returned empty %s data", endpoint)
+                continue
+            if fatal is None and (
+                not update_result.succeeded or not self._has_data(endpoint)
+            ):
+                fatal = err
+            _LOGGER.warning("Error updating panel %s data: %s", endpoint, err)
+
+        if fatal is not None:
+            _LOGGER.error("Error updating panel: %s", fatal, exc_info=fatal)
+            raise fatal
+
+    @property
+    def snapshot(self) -> SpanPanelSnapshot:
+        """Get the current read-only snapshot of all panel data"""
+        return self._snapshot
+
+    @property
+    def generation(self) -> int:
+        """Get the generation of the current snapshot"""
+        return self._snapshot.generation
+
     @property
     def status(self) -> SpanPanelHardwareStatus:
         """Get status data atomically"""
@@ -136,9 +458,14 @@ class SpanPanel:
         return self._get_data()
 
     @property
-    def circuits(self) -> Dict[str, SpanPanelCircuit]:
+    def circuits(self) -> Mapping[str, SpanPanelCircuit]:
         """Get circuits data atomically"""
-        return deepcopy(self._circuits)
+        return self._snapshot.circuits
+
+    @property
+    def circuit_table(self) -> CircuitTable:
+        """Get circuit telemetry in columnar form"""
+        return self._snapshot.circuit_table
 
     @property
     def storage_battery(self) -> SpanPanelStorageBattery:
@@ -0,0 +1,68 @@
+"""Panel-wide totals computed from the circuit table."""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Mapping
+from dataclasses import dataclass
+from itertools import compress
+from operator import mul
+from types import MappingProxyType
+
+from .const import AGGREGATE_TOP_CONSUMERS, CircuitPriority
+from .span_panel_circuit_table import PRIORITIES, CircuitTable
+
+
+@dataclass(frozen=True)
+class SpanPanelAggregates:
+    """
+    Totals over all circuits, in watts drawn: a producing circuit such as
+    solar counts as negative, so the totals net out like the grid meter.
+    Each one is a single pass over a column of the circuit table done by
+    builtins (sum, map, compress), so computing all of them costs about as
+    much as one template summing the circuits.
+    """
+
+    circuits_power: float
+    # Grid power not accounted for by any circuit; None without panel data
+    unmetered_power: float | None
+    leg1_power: float
+    leg2_power: float
+    priority_power: Mapping[CircuitPriority, float]
+    sheddable_power: float
+    never_backup_power: float
+    # Circuit ids and power of the largest consumers, largest first;
+    # producing circuits are left out
+    top_consumers: tuple[tuple[str, float], ...]
+
+    @classmethod
+    def compute(
+        cls,
+        table: CircuitTable,
+        grid_power: float | None,
+        top_consumers: int = AGGREGATE_TOP_CONSUMERS,
+    ) -> SpanPanelAggregates:
+        power = table.consumption()
+        circuits_power = sum(power)
+        # Priorities are few, one selector pass over the codes for each
+        priority_power = {
+            priority: sum(compress(power, map(code.__eq__, table.priority)), 0.0)
+            for code, priority in enumerate(PRIORITIES)
+        }
+        top = heapq.nlargest(
+            top_consumers,
+            (row for row, value in enumerate(power) if value > 0),
+            key=power.__getitem__,
+        )
+        return cls(
+            circuits_power=circuits_power,
+            unmetered_power=(
+                None if grid_power is None else grid_power - circuits_power
+            ),
+            leg1_power=sum(map(mul, power, table.leg1_share)),
+            leg2_power=sum(map(mul, power, table.leg2_share)),
+            priority_power=MappingProxyType(priority_power),
+            sheddable_power=sum(compress(power, table.is_sheddable)),
+            never_backup_power=sum(compress(power, table.is_never_backup)),
+            top_consumers=tuple((table.ids[row], power[row]) for row in top),
+        )
@@ -1,25 +1,107 @@
 """Span Panel API"""
 
+import asyncio
+import contextlib
+import json
 import logging
+import time
 import uuid
-from copy import deepcopy
+from dataclasses import dataclass
 from typing import Any, Dict
 
 from homeassistant.helpers.httpx_client import httpx
 
-from .const import (API_TIMEOUT, PANEL_MAIN_RELAY_STATE_UNKNOWN_VALUE,
-                    SPAN_CIRCUITS, SPAN_SOE, URL_CIRCUITS, URL_PANEL,
-                    URL_REGISTER, URL_STATUS, URL_STORAGE_BATTERY,
-                    CircuitPriority, CircuitRelayState)
-from .exceptions import SpanPanelReturnedEmptyData
+from .const import (API_TIMEOUT, ENDPOINT_BATTERY, ENDPOINT_CIRCUITS,
+                    ENDPOINT_PANEL, ENDPOINT_STATUS, HTTP_KEEPALIVE_EXPIRY,
+                    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    PANEL_MAIN_RELAY_STATE_UNKNOWN_VALUE, SPAN_CIRCUITS,
+                    SPAN_SOE, URL_CIRCUITS, URL_PANEL, URL_REGISTER,
+                    URL_STATUS, URL_STORAGE_BATTERY, CircuitPriority,
+                    CircuitRelayState)
+from .exceptions import (SpanPanelCircuitBreakerOpen,
+                         SpanPanelDeadlineExceeded, SpanPanelReturnedEmptyData)
 from .options import Options
 from .span_panel_circuit import SpanPanelCircuit
 from .span_panel_data import SpanPanelData
+from .span_panel_deadline import SpanPanelDeadline
 from .span_panel_hardware_status import SpanPanelHardwareStatus
+from .span_panel_json import json_loads
+from .span_panel_recorder import SpanPanelWireRecorder
+from .span_panel_retry import (CircuitBreakerState, RetryPolicy,
+                               SpanPanelCircuitBreaker)
+from .span_panel_schema import (CIRCUIT_SCHEMA, PANEL_SCHEMA, STATUS_SCHEMA,
+                                STORAGE_BATTERY_SCHEMA,
+                                SpanPanelSchemaRegistry)
 from .span_panel_storage_battery import SpanPanelStorageBattery
 
 _LOGGER = logging.getLogger(__name__)
 
+TRACE_CONNECT_TCP_COMPLETE = "connection.connect_tcp.complete"
+
+# What a request to the panel can fail with: transport and HTTP status
+# errors, an open circuit breaker, an empty or undecodable payload, or the
+# deadline of the request running out
+SPAN_PANEL_API_ERRORS = (
+    httpx.HTTPError,
+    SpanPanelCircuitBreakerOpen,
+    SpanPanelDeadlineExceeded,
+    SpanPanelReturnedEmptyData,
+    json.JSONDecodeError,
+)
+
+# Keep-alive pool of the session of one panel
+HTTP_LIMITS = httpx.Limits(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+)
+
+
+@dataclass
+class SpanPanelConnectionStats:
+    """Counters describing how well the HTTP session reuses connections."""
+
+    requests: int = 0
+    connections_opened: int = 0
+    # GETs answered by an in-flight request or a fresh snapshot
+    requests_coalesced: int = 0
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+
+class SpanPanelRawPayloads:
+    """
+    Latest response body of each endpoint, kept as the original bytes and
+    decoded only when asked for. Bodies are retained while enabled or while
+    debug logging is on, and appear in the diagnostics; otherwise nothing is
+    kept.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._bodies: dict[str, bytes] = {}
+
+    def store(self, endpoint: str, content: bytes) -> None:
+        if self.enabled or _LOGGER.isEnabledFor(logging.DEBUG):
+            self._bodies[endpoint] = content
+        elif self._bodies:
+            self._bodies.clear()
+
+    def get(self, endpoint: str) -> Any | None:
+        """Decode the retained body of an endpoint."""
+        if (content := self._bodies.get(endpoint)) is None:
+            return None
+        return json_loads(content)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {endpoint: self.get(endpoint) for endpoint in self._bodies}
+
+    def disable(self) -> None:
+        self.enabled = False
+        self._bodies.clear()
+
 
 class SpanPanelApi:
     """Span Panel API"""
@@ -30,17 +112,100 @@ class SpanPanelApi:
         access_token: str | None = None,    # nosec
         options: Options | None = None,
         async_client: httpx.AsyncClient | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: SpanPanelCircuitBreaker | None = None,
+        recorder: SpanPanelWireRecorder | None = None,
+        freshness_window: float = 0.0,
+        request_limiter: asyncio.Semaphore | None = None,
     ) -> None:
         self.host: str = host.lower()
         self.access_token: str | None = access_token
         self.options: Options | None = options
+        # A client passed in is shared and stays open. A transport passed with
+        # it is this panel's own connection pool and is released by close();
+        # without a client, the API creates one and owns it.
         self._async_client = async_client
+        self._transport = transport
+        self._owns_client = async_client is None
+        self.connection_stats = SpanPanelConnectionStats()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or SpanPanelCircuitBreaker()
+        self._probe_lock = asyncio.Lock()
+        # Opt-in capture of raw request/response pairs for offline replay
+        self.recorder = recorder
+        # Concurrent GETs of the same URL share one request, and a response
+        # younger than freshness_window seconds is reused instead of refetched
+        self.freshness_window = freshness_window
+        self._in_flight: dict[str, asyncio.Task[httpx.Response]] = {}
+        self._fresh: dict[str, tuple[float, httpx.Response]] = {}
+        # Optional limit on requests in flight shared with other panels
+        self.request_limiter = request_limiter
+        self.raw_payloads = SpanPanelRawPayloads()
+        self.schemas = SpanPanelSchemaRegistry()
 
     @property
-    def async_client(self):
-        """Return the httpx.AsyncClient"""
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Return the long-lived httpx.AsyncClient. Without a client passed in,
+        one is created on first use; the integration always passes one.
+        """
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                verify=True, limits=HTTP_LIMITS, timeout=API_TIMEOUT
+            )
+            self._owns_client = True
+        return self._async_client
+
+    async def close(self) -> None:
+        """Close the HTTP session or connection pool owned by this API object"""
+        if self._owns_client and self._async_client is not None:
+            await self._async_client.aclose()
+        elif self._transport is not None:
+            await self._transport.aclose()
+        self._async_client = None
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        deadline: SpanPanelDeadline | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request through the pooled session, recording it if enabled.
+        With a deadline, the timeout is taken once the request limiter lets
+        the request through, so time spent queued comes out of the budget.
+        """
+        self.connection_stats.requests += 1
+        started = time.monotonic()
+        try:
+            async with self.request_limiter or contextlib.nullcontext():
+                if deadline is not None:
+                    kwargs["timeout"] = deadline.timeout()
+                resp = await self.async_client.request(
+                    method, url, extensions={"trace": self._trace}, **kwargs
+                )
+        except httpx.TransportError as err:
+            if self.recorder is not None:
+                await self.recorder.record(
+                    method, url, time.monotonic() - started, error=err
+                )
+            raise
+        if self.recorder is not None:
+            await self.recorder.record(
+                method,
+                url,
+                time.monotonic() - started,
+                response=resp,
+                request_body=resp.request.content,
+            )
+        return resp
 
-        return self._async_client or httpx.AsyncClient(verify=True)
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """Count new TCP connections reported by the connection pool"""
+        if event_name == TRACE_CONNECT_TCP_COMPLETE:
+            self.connection_stats.connections_opened += 1
 
     async def ping(self) -> bool:
         """Ping the Span Panel API"""
@@ -74,20 +239,32 @@ class SpanPanelApi:
                 "description": "Home Assistant Local Span Integration",
             },
         )
-        return register_results.json()["accessToken"]
+        return json_loads(register_results.content)["accessToken"]
 
-    async def get_status_data(self) -> SpanPanelHardwareStatus:
+    async def get_status_data(
+        self, deadline: SpanPanelDeadline | None = None
+    ) -> SpanPanelHardwareStatus:
         """Get the status data"""
-        response = await self.get_data(URL_STATUS)
-        status_data = SpanPanelHardwareStatus.from_dict(response.json())
+        response = await self.get_data(URL_STATUS, deadline=deadline)
+        self.raw_payloads.store(ENDPOINT_STATUS, response.content)
+        status_data = self.schemas.parse(STATUS_SCHEMA, json_loads(response.content))
+        # Payload shapes are validated once per firmware version
+        self.schemas.set_firmware_version(status_data.firmware_version)
         return status_data
 
-    async def get_panel_data(self) -> SpanPanelData:
+    async def get_panel_data(
+        self,
+        deadline: SpanPanelDeadline | None = None,
+        max_age: float | None = None,
+    ) -> SpanPanelData:
         """Get the panel data"""
-        response = await self.get_data(URL_PANEL)
-        # Deep copy the raw data before processing in case cached data cleaned up
-        raw_data = deepcopy(response.json())
-        panel_data = SpanPanelData.from_dict(raw_data, self.options)
+        response = await self.get_data(
+            URL_PANEL, max_age=max_age, deadline=deadline
+        )
+        self.raw_payloads.store(ENDPOINT_PANEL, response.content)
+        panel_data = self.schemas.parse(PANEL_SCHEMA, json_loads(response.content))
+        if self.options and self.options.enable_solar_sensors:
+            panel_data = panel_data.with_solar_inverter(self.options)
 
         # Span Panel API might return empty result.
         # We use relay state == UNKNOWN as an indication of that scenario.
@@ -96,30 +273,45 @@ class SpanPanelApi:
 
         return panel_data
 
-    async def get_circuits_data(self) -> Dict[str, SpanPanelCircuit]:
+    async def get_circuits_data(
+        self,
+        deadline: SpanPanelDeadline | None = None,
+        max_age: float | None = None,
+    ) -> Dict[str, SpanPanelCircuit]:
         """Get the circuits data"""
-        response = await self.get_data(URL_CIRCUITS)
-        raw_circuits_data = deepcopy(response.json()[SPAN_CIRCUITS])
+        response = await self.get_data(
+            URL_CIRCUITS, max_age=max_age, deadline=deadline
+        )
+        self.raw_payloads.store(ENDPOINT_CIRCUITS, response.content)
+        raw_circuits_data = json_loads(response.content)[SPAN_CIRCUITS]
 
         if not raw_circuits_data:
             raise SpanPanelReturnedEmptyData()
 
-        circuits_data: Dict[str, SpanPanelCircuit] = {}
-        for circuit_id, raw_circuit_data in raw_circuits_data.items():
-            circuits_data[circuit_id] = SpanPanelCircuit.from_dict(raw_circuit_data)
+        circuits_data: Dict[str, SpanPanelCircuit] = self.schemas.parse_each(
+            CIRCUIT_SCHEMA, raw_circuits_data
+        )
         return circuits_data
 
-    async def get_storage_battery_data(self) -> SpanPanelStorageBattery:
+    async def get_circuit_data(self, circuit_id: str) -> SpanPanelCircuit:
+        """Get the data of a single circuit"""
+        response = await self.get_data(f"{URL_CIRCUITS}/{circuit_id}", max_age=0)
+        return self.schemas.parse(CIRCUIT_SCHEMA, json_loads(response.content))
+
+    async def get_storage_battery_data(
+        self, deadline: SpanPanelDeadline | None = None
+    ) -> SpanPanelStorageBattery:
         """Get the storage battery data"""
-        response = await self.get_data(URL_STORAGE_BATTERY)
-        storage_battery_data = response.json()[SPAN_SOE]
+        response = await self.get_data(URL_STORAGE_BATTERY, deadline=deadline)
+        self.raw_payloads.store(ENDPOINT_BATTERY, response.content)
+        storage_battery_data = json_loads(response.content)[SPAN_SOE]
 
         # Span Panel API might return empty result.
         # We use relay state == UNKNOWN as an indication of that scenario.
         if not storage_battery_data:
             raise SpanPanelReturnedEmptyData()
 
-        return SpanPanelStorageBattery.from_dic(storage_battery_data)
+        return self.schemas.parse(STORAGE_BATTERY_SCHEMA, storage_battery_data)
 
     async def set_relay(self, circuit: SpanPanelCircuit, state: CircuitRelayState):
         """Set the relay state"""
@@ -135,45 +327,198 @@ class SpanPanelApi:
             {"priorityIn": {"priority": priority.name}},
         )
 
-    async def get_data(self, url) -> httpx.Response:
+    async def get_data(
+        self,
+        url,
+        max_age: float | None = None,
+        deadline: SpanPanelDeadline | None = None,
+    ) -> httpx.Response:
         """
-        Fetch data from the endpoint and if inverters selected default
-        to fetching inverter data.
-        Update from PC endpoint.
+        Fetch data from the endpoint.
+
+        Concurrent callers for the same URL share a single in-flight request.
+        A response fetched less than max_age seconds ago (freshness_window by
+        default, and never longer, as older responses are not kept) is
+        returned without a new request. A deadline bounds the
+        timeouts and retries of the request, and how long each caller waits
+        on a request shared with others.
         """
         formatted_url = url.format(self.host)
-        response = await self._async_fetch_with_retry(
-            formatted_url, follow_redirects=False
-        )
-        return response
+        window = self.freshness_window if max_age is None else max_age
+        fresh = self._fresh.get(formatted_url)
+        if fresh is not None:
+            age = time.monotonic() - fresh[0]
+            if age <= window:
+                self.connection_stats.requests_coalesced += 1
+                return fresh[1]
+            if age > self.freshness_window:
+                del self._fresh[formatted_url]
+
+        task = self._in_flight.get(formatted_url)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._async_fetch_with_retry(
+                    formatted_url, deadline=deadline, follow_redirects=False
+                )
+            )
+            self._in_flight[formatted_url] = task
+            task.add_done_callback(
+                lambda done: self._fetch_done(formatted_url, done)
+            )
+        else:
+            self.connection_stats.requests_coalesced += 1
+        # Shield so one caller being cancelled does not cancel the others
+        if deadline is None:
+            return await asyncio.shield(task)
+        # The shared request runs on the deadline of the caller that started
+        # it, so every other caller bounds its own wait
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(task), timeout=deadline.remaining()
+            )
+        except asyncio.TimeoutError:
+            raise SpanPanelDeadlineExceeded(
+                f"Update budget of {deadline.budget:.1f}s exhausted"
+            ) from None
+
+    def _fetch_done(self, url: str, task: asyncio.Task[httpx.Response]) -> None:
+        """Retire a finished shared request and remember a successful response."""
+        if self._in_flight.get(url) is task:
+            del self._in_flight[url]
+            if (
+                self.freshness_window
+                and not task.cancelled()
+                and task.exception() is None
+            ):
+                now = time.monotonic()
+                self._drop_expired(now)
+                self._fresh[url] = (now, task.result())
+        elif not task.cancelled():
+            # Retrieve the exception so an orphaned request does not log it
+            task.exception()
+
+    def _drop_expired(self, now: float) -> None:
+        """Forget responses older than the freshness window."""
+        expired = [
+            url
+            for url, (fetched_at, _) in self._fresh.items()
+            if now - fetched_at > self.freshness_window
+        ]
+        for url in expired:
+            del self._fresh[url]
+
+    def invalidate(self) -> None:
+        """Forget shared and fresh responses, e.g. after changing panel state."""
+        self._in_flight.clear()
+        self._fresh.clear()
 
     async def post_data(self, url: str, payload: dict) -> httpx.Response:
         """Post data to the endpoint"""
         formatted_url = url.format(self.host)
+        # Reads issued after a command must observe it, not an older snapshot
+        self.invalidate()
         response = await self._async_post(formatted_url, payload)
+        self.invalidate()
         return response
 
-    async def _async_fetch_with_retry(self, url, **kwargs) -> httpx.Response:
+    async def _ensure_breaker_allows(
+        self, deadline: SpanPanelDeadline | None = None
+    ) -> None:
+        """
+        Fail fast while the circuit breaker is open. When half-open, probe the
+        unauthenticated status endpoint once before letting requests through,
+        within the deadline of the caller when given.
+        """
+        breaker = self.circuit_breaker
+        if breaker.state is CircuitBreakerState.CLOSED:
+            return
+        async with self._probe_lock:
+            # Another caller may have probed while we waited for the lock
+            state = breaker.state
+            if state is CircuitBreakerState.CLOSED:
+                return
+            if state is CircuitBreakerState.OPEN:
+                raise SpanPanelCircuitBreakerOpen(
+                    f"Span Panel unreachable, retrying in {breaker.retry_in:.0f}s"
+                )
+            _LOGGER.debug("Circuit breaker half-open, probing %s", self.host)
+            try:
+                resp = await self._send(
+                    "GET",
+                    URL_STATUS.format(self.host),
+                    deadline=deadline,
+                    timeout=API_TIMEOUT,
+                    headers={"Accept": "application/json"},
+                )
+                resp.raise_for_status()
+            except httpx.HTTPError as err:
+                # A probe cut short by our own budget says nothing about the
+                # panel; the next caller probes again
+                if deadline is None or not deadline.expired:
+                    breaker.record_failure(err)
+                raise SpanPanelCircuitBreakerOpen(
+                    f"Span Panel probe failed: {err}"
+                ) from err
+            _LOGGER.info("Span Panel %s reachable again, resuming polling", self.host)
+            breaker.record_success()
+
+    def _record_outcome(self, err: httpx.HTTPError | None) -> None:
+        """Feed the result of a request to the circuit breaker."""
+        if err is None:
+            self.circuit_breaker.record_success()
+        elif isinstance(err, httpx.TransportError) or (
+            isinstance(err, httpx.HTTPStatusError)
+            and err.response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR
+        ):
+            self.circuit_breaker.record_failure(err)
+
+    async def _async_fetch_with_retry(
+        self, url, deadline: SpanPanelDeadline | None = None, **kwargs
+    ) -> httpx.Response:
         """
-        Retry 3 times to fetch the url if there is a transport error.
+        Fetch the url, retrying transport errors with backoff and jitter.
+        With a deadline, timeouts come from the time remaining and no retry
+        is attempted that could not finish before it.
         """
+        await self._ensure_breaker_allows(deadline)
+
         headers = {"Accept": "application/json"}
         if self.access_token:
             headers["Authorization"] = f"Bearer {self.access_token}"
 
-        for attempt in range(3):
+        attempts = self.retry_policy.attempts
+        for attempt in range(attempts):
             _LOGGER.debug("HTTP GET Attempt #%s: %s", attempt + 1, url)
             try:
-                async with self.async_client as client:
-                    resp = await client.get(
-                        url, timeout=API_TIMEOUT, headers=headers, **kwargs
-                    )
-                    resp.raise_for_status()
+                resp = await self._send(
+                    "GET",
+                    url,
+                    deadline=deadline,
+                    timeout=API_TIMEOUT,
+                    headers=headers,
+                    **kwargs,
+                )
+                resp.raise_for_status()
+                # Only decode the body to text when it is actually logged
+                if _LOGGER.isEnabledFor(logging.DEBUG):
                     _LOGGER.debug("Fetched from %s: %s: %s", url, resp, resp.text)
-                    return resp
-            except httpx.TransportError:
-                if attempt == 2:
+                self._record_outcome(None)
+                return resp
+            except httpx.TransportError as err:
+                delay = self.retry_policy.delay(attempt)
+                if deadline is not None and deadline.remaining() <= delay:
+                    # Our budget ran out, which says nothing about the panel
+                    if not deadline.expired:
+                        self._record_outcome(err)
+                    raise
+                if attempt == attempts - 1:
+                    self._record_outcome(err)
                     raise
+                _LOGGER.debug("HTTP GET %s failed (%s), retrying in %.2fs", url, err, delay)
+                await asyncio.sleep(delay)
+            except httpx.HTTPStatusError as err:
+                self._record_outcome(err)
+                raise
         raise httpx.TransportError("Too many attempts")
 
     async def _async_post(
@@ -186,11 +531,23 @@ class SpanPanelApi:
         if self.access_token:
             headers["Authorization"] = f"Bearer {self.access_token}"
 
+        await self._ensure_breaker_allows()
+
         _LOGGER.debug("HTTP POST Attempt: %s", url)
-        async with self.async_client as client:
-            resp = await client.post(
-                url, json=json, headers=headers, timeout=API_TIMEOUT, **kwargs
+        try:
+            resp = await self._send(
+                "POST",
+                url,
+                json=json,
+                headers=headers,
+                timeout=API_TIMEOUT,
+                **kwargs,
             )
             resp.raise_for_status()
+        except httpx.HTTPError as err:
+            self._record_outcome(err)
+            raise
+        self._record_outcome(None)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug("HTTP POST %s: %s: %s", url, resp, resp.text)
-            return resp
+        return resp
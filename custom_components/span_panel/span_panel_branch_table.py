@@ -0,0 +1,77 @@
+"""Columnar storage of panel branch metering."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any
+
+
+@dataclass(frozen=True)
+class BranchTable:
+    """
+    Metering of every branch (breaker tab) of the panel, parsed once per
+    poll. Branch ids are the tab numbers; each maps to a row, and every
+    column is a contiguous array indexed by that row. Leg and branch groups
+    are summed straight from the columns.
+    """
+
+    ids: tuple[int, ...]
+    index: Mapping[int, int]
+    instant_power: array
+    imported_energy: array
+    exported_energy: array
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, branch_id: int) -> int | None:
+        """Return the row of a branch, None if the panel did not report it."""
+        return self.index.get(branch_id)
+
+    def total(self, column: str, branch_ids: Iterable[int]) -> float:
+        """Sum a column over a group of branches, skipping unknown ones."""
+        values = getattr(self, column)
+        index = self.index
+        return sum(
+            values[index[branch_id]] for branch_id in branch_ids if branch_id in index
+        )
+
+    @classmethod
+    def empty(cls) -> BranchTable:
+        return cls.from_payload(())
+
+    @classmethod
+    def from_payload(cls, branches: Sequence[Mapping[str, Any]]) -> BranchTable:
+        """
+        Build the table from the branches of a panel payload. A branch
+        without an id takes its position, and missing readings count as 0.
+        """
+        ids, index = _branch_index(
+            tuple([branch.get("id", row + 1) for row, branch in enumerate(branches)])
+        )
+        return cls(
+            ids=ids,
+            index=index,
+            instant_power=array(
+                "d", [branch.get("instantPowerW", 0.0) for branch in branches]
+            ),
+            imported_energy=array(
+                "d", [branch.get("importedActiveEnergyWh", 0.0) for branch in branches]
+            ),
+            exported_energy=array(
+                "d", [branch.get("exportedActiveEnergyWh", 0.0) for branch in branches]
+            ),
+        )
+
+
+@lru_cache(maxsize=8)
+def _branch_index(
+    payload_ids: tuple[Any, ...]
+) -> tuple[tuple[int, ...], Mapping[int, int]]:
+    # The set of branches rarely changes, so the row index is built once
+    ids = tuple(int(branch_id) for branch_id in payload_ids)
+    return ids, MappingProxyType({branch_id: row for row, branch_id in enumerate(ids)})
@@ -0,0 +1,191 @@
+"""Short high-rate sampling of panel power readings."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import logging
+import math
+import time
+from collections.abc import Callable, Collection, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .const import (BURST_MAX_SAMPLES, BURST_PERCENTILES, ENDPOINT_CIRCUITS,
+                    ENDPOINT_PANEL, PANEL_POWER_READINGS)
+from .exceptions import SpanPanelCircuitBreakerOpen, SpanPanelReturnedEmptyData
+from .span_panel_api import SpanPanelApi
+from .span_panel_circuit_table import circuit_consumption
+from .span_panel_ring_buffer import RingBuffer
+
+_LOGGER = logging.getLogger(__name__)
+
+BURST_ENDPOINTS = (ENDPOINT_CIRCUITS, ENDPOINT_PANEL)
+
+
+def summarize(values: Iterable[float]) -> dict[str, Any] | None:
+    """
+    Count, min, max, mean and percentiles of the readings of one series,
+    NaN rows excluded. Percentiles interpolate linearly between the closest
+    ranks. None when the series has no reading.
+    """
+    ordered = sorted(value for value in values if not math.isnan(value))
+    if not ordered:
+        return None
+    last = len(ordered) - 1
+    stats: dict[str, Any] = {
+        "count": len(ordered),
+        "min": ordered[0],
+        "max": ordered[last],
+        "mean": math.fsum(ordered) / len(ordered),
+    }
+    for percentile in BURST_PERCENTILES:
+        rank = last * percentile / 100
+        low = int(rank)
+        high = min(low + 1, last)
+        stats[f"p{percentile}"] = ordered[low] + (ordered[high] - ordered[low]) * (
+            rank - low
+        )
+    return stats
+
+
+@dataclass
+class SpanPanelBurstCapture:
+    """
+    One burst capture of a panel. Readings are fetched straight from the
+    API every interval seconds, bypassing the response freshness window,
+    and kept only in the ring buffer: the published snapshot is never
+    touched, so entities write no extra states while the capture runs.
+    """
+
+    api: SpanPanelApi
+    duration: float
+    interval: float
+    endpoints: Collection[str] = (ENDPOINT_CIRCUITS,)
+    # Circuit ids to sample; all circuits when empty
+    circuit_ids: Collection[str] = ()
+    circuit_names: dict[str, str] = field(default_factory=dict)
+    buffer: RingBuffer = field(init=False)
+    started_at: float | None = None
+    errors: int = 0
+
+    def __post_init__(self) -> None:
+        self.buffer = RingBuffer(
+            max(1, min(math.ceil(self.duration / self.interval), BURST_MAX_SAMPLES))
+        )
+
+    async def run(self) -> None:
+        """Sample until the duration elapses, on a fixed tick schedule."""
+        self.started_at = time.time()
+        start = time.monotonic()
+        end = start + self.duration
+        tick = 0
+        while time.monotonic() < end:
+            await self._sample()
+            # Ticks missed by a slow response are skipped, not bunched up
+            tick = max(tick + 1, math.ceil((time.monotonic() - start) / self.interval))
+            next_at = start + tick * self.interval
+            if next_at >= end:
+                break
+            await asyncio.sleep(max(next_at - time.monotonic(), 0.0))
+        _LOGGER.debug(
+            "Burst capture took %d samples in %.1fs (%d errors)",
+            self.buffer.count,
+            time.monotonic() - start,
+            self.errors,
+        )
+
+    async def _sample(self) -> None:
+        values: dict[str, float] = {}
+        fetchers: list[Callable[[dict[str, float]], Any]] = []
+        if ENDPOINT_CIRCUITS in self.endpoints:
+            fetchers.append(self._sample_circuits)
+        if ENDPOINT_PANEL in self.endpoints:
+            fetchers.append(self._sample_panel)
+        timestamp = time.time()
+        results = await asyncio.gather(
+            *(fetch(values) for fetch in fetchers), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.errors += 1
+                if not isinstance(
+                    result, (SpanPanelCircuitBreakerOpen, SpanPanelReturnedEmptyData)
+                ):
+                    _LOGGER.debug("Burst sample failed: %r", result)
+        if values:
+            self.buffer.append(timestamp, values)
+
+    async def _sample_circuits(self, values: dict[str, float]) -> None:
+        circuits = await self.api.get_circuits_data(max_age=0)
+        wanted = self.circuit_ids
+        for circuit_id, circuit in circuits.items():
+            if not wanted or circuit_id in wanted:
+                values[f"{ENDPOINT_CIRCUITS}.{circuit_id}"] = circuit_consumption(
+                    circuit.instant_power
+                )
+                self.circuit_names.setdefault(circuit_id, circuit.name)
+
+    async def _sample_panel(self, values: dict[str, float]) -> None:
+        panel = await self.api.get_panel_data(max_age=0)
+        for name in PANEL_POWER_READINGS:
+            values[f"{ENDPOINT_PANEL}.{name}"] = getattr(panel, name)
+
+    def summary(self) -> dict[str, Any]:
+        """Statistics of every sampled series, grouped by endpoint."""
+        buffer = self.buffer
+        rows = buffer.rows()
+        timestamps = [buffer.timestamps[row] for row in rows]
+        series: dict[str, dict[str, Any]] = {
+            endpoint: {} for endpoint in BURST_ENDPOINTS if endpoint in self.endpoints
+        }
+        for name, column in buffer.series.items():
+            endpoint, _, key = name.partition(".")
+            stats = summarize(column)
+            if stats is None:
+                continue
+            if endpoint == ENDPOINT_CIRCUITS:
+                stats = {"name": self.circuit_names.get(key), **stats}
+            series[endpoint][key] = stats
+        return {
+            "started_at": self.started_at,
+            "duration": (timestamps[-1] - timestamps[0]) if timestamps else 0.0,
+            "samples": buffer.count,
+            "retained": len(rows),
+            "errors": self.errors,
+            "interval": self.interval,
+            "mean_interval": (
+                (timestamps[-1] - timestamps[0]) / (len(timestamps) - 1)
+                if len(timestamps) > 1
+                else None
+            ),
+            "series": series,
+        }
+
+    def dump(self, path: Path) -> Path:
+        """
+        Write the retained samples as gzipped CSV, oldest first: one row per
+        sample, a timestamp column and one column per series, NaN left
+        empty. Blocking, run it in an executor.
+        """
+        buffer = self.buffer
+        names = sorted(buffer.series)
+        columns = [buffer.series[name] for name in names]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8", newline="") as file:
+            file.write(",".join(["timestamp", *names]) + "\n")
+            for row in buffer.rows():
+                file.write(
+                    ",".join(
+                        [
+                            f"{buffer.timestamps[row]:.3f}",
+                            *(
+                                "" if math.isnan(value) else f"{value:g}"
+                                for value in (column[row] for column in columns)
+                            ),
+                        ]
+                    )
+                    + "\n"
+                )
+        return path
@@ -0,0 +1,203 @@
+"""Columnar storage of circuit telemetry."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+from .const import CircuitPriority, CircuitRelayState
+from .span_panel_circuit import SpanPanelCircuit
+
+# Relay states and priorities are stored as their position in the enum
+RELAY_STATE_CODES: Mapping[str, int] = MappingProxyType(
+    {state.name: code for code, state in enumerate(CircuitRelayState)}
+)
+PRIORITY_CODES: Mapping[str, int] = MappingProxyType(
+    {priority.name: code for code, priority in enumerate(CircuitPriority)}
+)
+RELAY_STATES = tuple(CircuitRelayState)
+PRIORITIES = tuple(CircuitPriority)
+
+
+def tab_leg(tab: int) -> int:
+    """
+    Return the leg (0 or 1) feeding a breaker tab. Tabs are numbered down
+    both sides of the panel, and the legs alternate from one row to the next.
+    """
+    return ((tab - 1) // 2) % 2
+
+
+def circuit_consumption(instant_power: float) -> float:
+    """
+    Power drawn by a circuit, in watts, negative while it produces. The
+    panel reports the instant power of a consuming circuit as negative.
+    """
+    return -instant_power
+
+
+@lru_cache(maxsize=256)
+def leg_shares(tabs: tuple[int, ...]) -> tuple[float, float]:
+    """Return the fraction of a circuit's tabs on each leg."""
+    if not tabs:
+        return 0.0, 0.0
+    leg2 = sum(tab_leg(tab) for tab in tabs) / len(tabs)
+    return 1.0 - leg2, leg2
+
+
+@dataclass(frozen=True)
+class CircuitTable:
+    """
+    Struct-of-arrays view of circuit telemetry. Each circuit id maps to a
+    stable row, and every column is a contiguous array indexed by that row.
+    Tables are never modified once published; the next poll derives a new
+    one without allocating per-circuit objects.
+    """
+
+    ids: tuple[str, ...]
+    index: Mapping[str, int]
+    # Circuit each row was written from, to skip rows that did not change
+    circuits: tuple[SpanPanelCircuit, ...]
+    instant_power: array
+    produced_energy: array
+    consumed_energy: array
+    instant_power_update_time: array
+    energy_accum_update_time: array
+    relay_state: array
+    priority: array
+    is_sheddable: array
+    is_never_backup: array
+    # Fraction of the circuit's tabs on each leg
+    leg1_share: array
+    leg2_share: array
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, circuit_id: str) -> int | None:
+        """Return the row of a circuit, None if it is not in the table."""
+        return self.index.get(circuit_id)
+
+    def relay_state_of(self, row: int) -> CircuitRelayState:
+        return RELAY_STATES[self.relay_state[row]]
+
+    def priority_of(self, row: int) -> CircuitPriority:
+        return PRIORITIES[self.priority[row]]
+
+    def consumption(self) -> array:
+        """Power drawn by every circuit, as circuit_consumption() of each row."""
+        return array("d", map(circuit_consumption, self.instant_power))
+
+    def total_power(self) -> float:
+        """Net power drawn by all circuits, producers counting as negative."""
+        return -sum(self.instant_power)
+
+    @classmethod
+    def empty(cls) -> CircuitTable:
+        return cls._allocate((), ())
+
+    @classmethod
+    def _allocate(
+        cls, ids: tuple[str, ...], circuits: tuple[SpanPanelCircuit, ...]
+    ) -> CircuitTable:
+        size = len(ids)
+        return cls(
+            ids=ids,
+            index=MappingProxyType(
+                {circuit_id: row for row, circuit_id in enumerate(ids)}
+            ),
+            circuits=circuits,
+            instant_power=array("d", bytes(8 * size)),
+            produced_energy=array("d", bytes(8 * size)),
+            consumed_energy=array("d", bytes(8 * size)),
+            instant_power_update_time=array("q", bytes(8 * size)),
+            energy_accum_update_time=array("q", bytes(8 * size)),
+            relay_state=array("b", bytes(size)),
+            priority=array("b", bytes(size)),
+            is_sheddable=array("b", bytes(size)),
+            is_never_backup=array("b", bytes(size)),
+            leg1_share=array("d", bytes(8 * size)),
+            leg2_share=array("d", bytes(8 * size)),
+        )
+
+    def _copy(self, circuits: tuple[SpanPanelCircuit, ...]) -> CircuitTable:
+        # Copying an array is a single memory copy; the row index is shared
+        return CircuitTable(
+            ids=self.ids,
+            index=self.index,
+            circuits=circuits,
+            instant_power=array("d", self.instant_power),
+            produced_energy=array("d", self.produced_energy),
+            consumed_energy=array("d", self.consumed_energy),
+            instant_power_update_time=array("q", self.instant_power_update_time),
+            energy_accum_update_time=array("q", self.energy_accum_update_time),
+            relay_state=array("b", self.relay_state),
+            priority=array("b", self.priority),
+            is_sheddable=array("b", self.is_sheddable),
+            is_never_backup=array("b", self.is_never_backup),
+            leg1_share=array("d", self.leg1_share),
+            leg2_share=array("d", self.leg2_share),
+        )
+
+    def _write_row(self, row: int, circuit: SpanPanelCircuit) -> None:
+        self._write_readings(row, circuit)
+        self._write_settings(row, circuit)
+
+    def _write_readings(self, row: int, circuit: SpanPanelCircuit) -> None:
+        self.instant_power[row] = float(circuit.instant_power)
+        self.produced_energy[row] = float(circuit.produced_energy)
+        self.consumed_energy[row] = float(circuit.consumed_energy)
+        self.instant_power_update_time[row] = int(circuit.instant_power_update_time)
+        self.energy_accum_update_time[row] = int(circuit.energy_accum_update_time)
+
+    def _write_settings(self, row: int, circuit: SpanPanelCircuit) -> None:
+        self.relay_state[row] = RELAY_STATE_CODES.get(
+            circuit.relay_state, RELAY_STATE_CODES[CircuitRelayState.UNKNOWN.name]
+        )
+        self.priority[row] = PRIORITY_CODES.get(
+            circuit.priority, PRIORITY_CODES[CircuitPriority.UNKNOWN.name]
+        )
+        self.is_sheddable[row] = circuit.is_sheddable
+        self.is_never_backup[row] = circuit.is_never_backup
+        self.leg1_share[row], self.leg2_share[row] = leg_shares(tuple(circuit.tabs))
+
+    def evolve(self, circuits: Mapping[str, SpanPanelCircuit]) -> CircuitTable:
+        """
+        Return the table for a new set of circuits. While the set of circuit
+        ids is unchanged the rows and the index are kept and the columns are
+        copied in one block. Only rows whose circuit changed are rewritten,
+        and their settings only when those changed too.
+        """
+        ids = tuple(circuits)
+        rows = tuple(circuits.values())
+        if ids != self.ids:
+            table = self._allocate(ids, rows)
+            for row, circuit in enumerate(rows):
+                table._write_row(row, circuit)
+            return table
+        table = self._copy(rows)
+        for row, (circuit, previous) in enumerate(zip(rows, self.circuits)):
+            if circuit is previous:
+                continue
+            table._write_readings(row, circuit)
+            if (
+                circuit.relay_state != previous.relay_state
+                or circuit.priority != previous.priority
+                or circuit.tabs != previous.tabs
+                or circuit.is_sheddable != previous.is_sheddable
+                or circuit.is_never_backup != previous.is_never_backup
+            ):
+                table._write_settings(row, circuit)
+        return table
+
+    def replace_circuit(self, circuit: SpanPanelCircuit) -> CircuitTable:
+        """Return a copy with the row of one circuit rewritten."""
+        if (row := self.index.get(circuit.circuit_id)) is None:
+            return self
+        rows = list(self.circuits)
+        rows[row] = circuit
+        table = self._copy(tuple(rows))
+        table._write_row(row, circuit)
+        return table
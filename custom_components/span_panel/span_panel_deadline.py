@@ -0,0 +1,45 @@
+"""Per-update deadline shared by every request of a Span Panel poll"""
+
+import time
+
+from homeassistant.helpers.httpx_client import httpx
+
+from .const import DEADLINE_CONNECT_TIMEOUT, DEADLINE_LOW_PRIORITY_FRACTION
+from .exceptions import SpanPanelDeadlineExceeded
+
+
+class SpanPanelDeadline:
+    """
+    Time budget for one update cycle.
+
+    Requests derive their connect and read timeouts from the time remaining
+    so that retries and concurrent fetches never add up past the budget.
+    """
+
+    def __init__(
+        self, budget: float, connect_timeout: float = DEADLINE_CONNECT_TIMEOUT
+    ) -> None:
+        self.budget = budget
+        self.connect_timeout = connect_timeout
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    @property
+    def nearly_expired(self) -> bool:
+        """True once the budget left is too small for low-priority work."""
+        return self.remaining() < self.budget * DEADLINE_LOW_PRIORITY_FRACTION
+
+    def timeout(self) -> httpx.Timeout:
+        """Return request timeouts bounded by the time remaining."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise SpanPanelDeadlineExceeded(
+                f"Update budget of {self.budget:.1f}s exhausted"
+            )
+        return httpx.Timeout(remaining, connect=min(self.connect_timeout, remaining))
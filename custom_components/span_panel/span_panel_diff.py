@@ -0,0 +1,90 @@
+"""Differences between consecutive panel snapshots."""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import Any
+
+from .const import (ENDPOINT_BATTERY, ENDPOINT_CIRCUITS, ENDPOINT_PANEL,
+                    ENDPOINT_STATUS)
+from .span_panel_circuit import SpanPanelCircuit
+from .span_panel_snapshot import SpanPanelSnapshot
+
+CIRCUIT_FIELDS = frozenset(f.name for f in fields(SpanPanelCircuit))
+
+
+def diff_fields(before: Any, after: Any) -> frozenset[str]:
+    """Return the names of the dataclass fields that differ."""
+    if before is after:
+        return frozenset()
+    if before is None or after is None:
+        model = after if before is None else before
+        return frozenset(f.name for f in fields(model))
+    return frozenset(
+        f.name for f in fields(after) if getattr(before, f.name) != getattr(after, f.name)
+    )
+
+
+@dataclass(frozen=True)
+class SpanPanelSnapshotDiff:
+    """Fields changed per endpoint, and per circuit for the circuits endpoint."""
+
+    status: frozenset[str] = frozenset()
+    panel: frozenset[str] = frozenset()
+    storage_battery: frozenset[str] = frozenset()
+    circuits: Mapping[str, frozenset[str]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    def __bool__(self) -> bool:
+        return bool(self.status or self.panel or self.storage_battery or self.circuits)
+
+    def changed(
+        self,
+        endpoint: str,
+        circuit_id: str | None = None,
+        field_names: Collection[str] | None = None,
+    ) -> bool:
+        """
+        Return True if the endpoint changed, limited to one circuit and to
+        the given fields when those are set.
+        """
+        if endpoint == ENDPOINT_CIRCUITS:
+            if circuit_id is None:
+                changed = frozenset().union(*self.circuits.values())
+            else:
+                changed = self.circuits.get(circuit_id, frozenset())
+        else:
+            changed = {
+                ENDPOINT_STATUS: self.status,
+                ENDPOINT_PANEL: self.panel,
+                ENDPOINT_BATTERY: self.storage_battery,
+            }.get(endpoint, frozenset())
+        if field_names is None:
+            return bool(changed)
+        return not changed.isdisjoint(field_names)
+
+
+def diff_snapshots(
+    before: SpanPanelSnapshot, after: SpanPanelSnapshot
+) -> SpanPanelSnapshotDiff:
+    """Work out which parts of the panel changed between two snapshots."""
+    if before is after or before.generation == after.generation:
+        return SpanPanelSnapshotDiff()
+
+    circuits: dict[str, frozenset[str]] = {}
+    if before.circuits is not after.circuits:
+        for circuit_id, circuit in after.circuits.items():
+            if changed := diff_fields(before.circuits.get(circuit_id), circuit):
+                circuits[circuit_id] = changed
+        for circuit_id in before.circuits.keys() - after.circuits.keys():
+            circuits[circuit_id] = CIRCUIT_FIELDS
+
+    return SpanPanelSnapshotDiff(
+        status=diff_fields(before.status, after.status),
+        panel=diff_fields(before.panel, after.panel),
+        storage_battery=diff_fields(before.storage_battery, after.storage_battery),
+        circuits=MappingProxyType(circuits),
+    )
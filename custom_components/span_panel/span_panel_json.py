@@ -0,0 +1,21 @@
+"""JSON decoding for Span Panel API responses"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def json_loads(content: bytes) -> Any:
+    """
+    Parse a response body straight from its bytes.
+
+    orjson is used when it is installed (it ships with Home Assistant),
+    otherwise the standard library decoder.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
@@ -0,0 +1,161 @@
+"""Wire recorder and replay transport for the Span Panel API"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from homeassistant.helpers.httpx_client import httpx
+
+_LOGGER = logging.getLogger(__name__)
+
+# Responses of these paths carry credentials and are never written to disk
+UNRECORDED_PATHS = ("/api/v1/auth/register",)
+
+DEFAULT_RECORDER_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_RECORDER_BACKUP_COUNT = 3
+
+
+class SpanPanelWireRecorder:
+    """
+    Write raw request/response pairs as JSON lines to a size-capped file.
+
+    Bodies are stored base64 encoded so recordings reproduce the exact bytes
+    served by the panel firmware. When the file exceeds max_bytes it is
+    rotated to <path>.1 .. <path>.<backup_count>, like RotatingFileHandler.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_bytes: int = DEFAULT_RECORDER_MAX_BYTES,
+        backup_count: int = DEFAULT_RECORDER_BACKUP_COUNT,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.records_written = 0
+        self._lock = threading.Lock()
+
+    async def record(
+        self,
+        method: str,
+        url: str,
+        elapsed: float,
+        response: httpx.Response | None = None,
+        request_body: bytes = b"",
+        error: Exception | None = None,
+    ) -> None:
+        """Record one exchange without blocking the event loop."""
+        path = urlsplit(url).path
+        if path in UNRECORDED_PATHS:
+            return
+        entry: dict[str, Any] = {
+            "ts": time.time(),
+            "method": method,
+            "path": path,
+            "elapsed": round(elapsed, 6),
+            "request": base64.b64encode(request_body).decode("ascii"),
+            "status": response.status_code if response is not None else 0,
+            "body": (
+                base64.b64encode(response.content).decode("ascii")
+                if response is not None
+                else ""
+            ),
+        }
+        if error is not None:
+            entry["error"] = repr(error)
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        await asyncio.get_running_loop().run_in_executor(None, self._write, line)
+
+    def _write(self, line: str) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if (
+                self.path.exists()
+                and self.path.stat().st_size + len(line) > self.max_bytes
+            ):
+                self._rotate()
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write(line)
+            self.records_written += 1
+
+    def _rotate(self) -> None:
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backup_count > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+
+def load_recording(path: str | os.PathLike) -> list[dict[str, Any]]:
+    """Load a recording including its rotated backups, oldest first."""
+    base = Path(path)
+    backups = sorted(
+        base.parent.glob(f"{base.name}.*"),
+        key=lambda backup: int(backup.suffix[1:]) if backup.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    records: list[dict[str, Any]] = []
+    for file_path in [*backups, base]:
+        if not file_path.exists():
+            continue
+        with file_path.open(encoding="utf-8") as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+    return records
+
+
+class SpanPanelReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serve a wire recording back to SpanPanelApi.
+
+    Responses are returned per (method, path) in recorded order and wrap
+    around when exhausted. Each response is delayed by its recorded latency
+    divided by speed; a speed of 0 replays as fast as possible.
+    """
+
+    def __init__(
+        self, records: list[dict[str, Any]], speed: float = 1.0, loop: bool = True
+    ) -> None:
+        self.speed = speed
+        self.loop = loop
+        self.requests_served = 0
+        self._records: dict[tuple[str, str], deque[dict[str, Any]]] = {}
+        for record in records:
+            key = (record["method"], record["path"])
+            self._records.setdefault(key, deque()).append(record)
+
+    @classmethod
+    def from_file(
+        cls, path: str | os.PathLike, speed: float = 1.0, loop: bool = True
+    ) -> "SpanPanelReplayTransport":
+        return cls(load_recording(path), speed=speed, loop=loop)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        queue = self._records.get((request.method, request.url.path))
+        if not queue:
+            return httpx.Response(404, request=request)
+        record = queue.popleft()
+        if self.loop:
+            queue.append(record)
+        if self.speed > 0:
+            await asyncio.sleep(record["elapsed"] / self.speed)
+        self.requests_served += 1
+        if record.get("error"):
+            raise httpx.ConnectError(record["error"], request=request)
+        return httpx.Response(
+            record["status"],
+            headers={"Content-Type": "application/json"},
+            content=base64.b64decode(record["body"]),
+            request=request,
+        )
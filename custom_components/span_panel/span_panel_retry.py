@@ -0,0 +1,87 @@
+"""Retry policy and circuit breaker for the Span Panel API"""
+
+import enum
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with jitter between retried requests."""
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    # Fraction of the delay that is randomized to avoid synchronized retries
+    jitter: float = 0.5
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay in seconds before retrying after the given attempt."""
+        delay = min(self.base_delay * (2**attempt), self.max_delay)
+        return delay * (1 - self.jitter * random.random())  # nosec B311
+
+
+class CircuitBreakerState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class SpanPanelCircuitBreaker:
+    """
+    Per-panel circuit breaker.
+
+    The breaker opens after consecutive failures and fails requests fast
+    while open. Once the reset timeout has elapsed it becomes half-open so
+    that a single probe can decide whether polling resumes.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self._opened_at: float | None = None
+        self._last_error: str | None = None
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        if self._opened_at is None:
+            return CircuitBreakerState.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return CircuitBreakerState.HALF_OPEN
+        return CircuitBreakerState.OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the breaker allows a probe, 0 when not open."""
+        if self._opened_at is None:
+            return 0.0
+        return max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._last_error = None
+
+    def record_failure(self, err: Exception | None = None) -> None:
+        self.consecutive_failures += 1
+        if err is not None:
+            self._last_error = repr(err)
+        was_half_open = self.state is CircuitBreakerState.HALF_OPEN
+        if was_half_open or self.consecutive_failures >= self.failure_threshold:
+            if self._opened_at is None or was_half_open:
+                self.opened_count += 1
+            self._opened_at = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_count": self.opened_count,
+            "retry_in": round(self.retry_in, 1),
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,60 @@
+"""Fixed-capacity columnar ring buffer of timestamped samples."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Mapping
+
+_NAN = math.nan
+
+
+class RingBuffer:
+    """
+    Fixed-capacity sample store. Timestamps and every series are
+    preallocated arrays sharing one write position, so a sample overwrites
+    the oldest row in place once the buffer is full. A series first seen
+    after the first sample, or missing from one, reads NaN for those rows.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.timestamps = array("d", [_NAN]) * capacity
+        self.series: dict[str, array] = {}
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the timestamps and every series."""
+        return (len(self.series) + 1) * self.capacity * self.timestamps.itemsize
+
+    def append(self, timestamp: float, values: Mapping[str, float]) -> None:
+        """Store one sample, overwriting the oldest one when full."""
+        position = self.count % self.capacity
+        self.timestamps[position] = timestamp
+        series = self.series
+        for name in values.keys() - series.keys():
+            series[name] = array("d", [_NAN]) * self.capacity
+        for name, column in series.items():
+            column[position] = values.get(name, _NAN)
+        self.count += 1
+
+    def rows(self) -> list[int]:
+        """Positions of the stored samples, oldest first."""
+        if self.count <= self.capacity:
+            return list(range(self.count))
+        start = self.count % self.capacity
+        return [*range(start, self.capacity), *range(start)]
+
+    def window(self, start: float | None = None, end: float | None = None) -> list[int]:
+        """Positions of the samples taken between start and end, oldest first."""
+        timestamps = self.timestamps
+        return [
+            row
+            for row in self.rows()
+            if (start is None or timestamps[row] >= start)
+            and (end is None or timestamps[row] <= end)
+        ]
@@ -0,0 +1,172 @@
+"""In-memory multi-resolution store of panel power readings."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from typing import Any
+
+from .const import (ENDPOINT_CIRCUITS, ENDPOINT_PANEL, PANEL_POWER_READINGS,
+                    ROLLUP_DEFAULT_CAPACITY, ROLLUP_RAW, ROLLUP_RESOLUTIONS)
+from .span_panel_circuit_table import CircuitTable
+from .span_panel_data import SpanPanelData
+from .span_panel_ring_buffer import RingBuffer
+from .span_panel_snapshot import SpanPanelSnapshot
+
+
+class _Rollup:
+    """
+    Means of every series over fixed, wall-clock aligned buckets. Updates
+    are summed into the open bucket as they arrive; the bucket is closed
+    into the ring buffer by the first update past its end.
+    """
+
+    def __init__(self, resolution: int, capacity: int) -> None:
+        self.resolution = resolution
+        self.buffer = RingBuffer(capacity)
+        self.bucket: float | None = None
+        self.sums: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def add(self, timestamp: float, values: Mapping[str, float]) -> None:
+        bucket = timestamp - timestamp % self.resolution
+        if bucket != self.bucket:
+            self.close()
+            self.bucket = bucket
+        sums = self.sums
+        counts = self.counts
+        for name, value in values.items():
+            sums[name] = sums.get(name, 0.0) + value
+            counts[name] = counts.get(name, 0) + 1
+
+    def close(self) -> None:
+        if self.bucket is not None and self.sums:
+            counts = self.counts
+            self.buffer.append(
+                self.bucket,
+                {name: total / counts[name] for name, total in self.sums.items()},
+            )
+        self.sums = {}
+        self.counts = {}
+
+
+class SpanPanelRollupStore:
+    """
+    Circuit and panel power readings of the recent past, kept in memory so
+    that windows and averages never touch the recorder database. Every
+    update is stored raw and rolled up incrementally into each coarser
+    resolution. Each resolution holds at most capacity rows per series in
+    a ring buffer, so memory is bounded by capacity, the resolution count
+    and the number of series.
+    """
+
+    def __init__(self, capacity: int = ROLLUP_DEFAULT_CAPACITY) -> None:
+        self.capacity = capacity
+        self.raw = RingBuffer(capacity)
+        self.rollups = {
+            name: _Rollup(resolution, capacity)
+            for name, resolution in ROLLUP_RESOLUTIONS.items()
+            if resolution
+        }
+        self._circuit_table: CircuitTable | None = None
+        self._panel: SpanPanelData | None = None
+
+    def add_snapshot(self, snapshot: SpanPanelSnapshot, timestamp: float) -> None:
+        """
+        Store the readings of the parts of a snapshot that were replaced
+        since the previous one, so that an endpoint skipped by a poll is not
+        counted twice.
+        """
+        values: dict[str, float] = {}
+        table = snapshot.circuit_table
+        if table is not self._circuit_table and len(table):
+            self._circuit_table = table
+            values.update(zip(_circuit_series(table.ids), table.consumption()))
+        panel = snapshot.panel
+        if panel is not None and panel is not self._panel:
+            self._panel = panel
+            for reading in PANEL_POWER_READINGS:
+                values[panel_series(reading)] = getattr(panel, reading)
+        if values:
+            self.add(timestamp, values)
+
+    def add(self, timestamp: float, values: Mapping[str, float]) -> None:
+        """Store one update of some series at every resolution."""
+        self.raw.append(timestamp, values)
+        for rollup in self.rollups.values():
+            rollup.add(timestamp, values)
+
+    @property
+    def series(self) -> list[str]:
+        """Names of every stored series."""
+        return sorted(self.raw.series)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the ring buffers of every resolution."""
+        return self.raw.nbytes + sum(
+            rollup.buffer.nbytes for rollup in self.rollups.values()
+        )
+
+    def query(
+        self,
+        resolution: str = ROLLUP_RAW,
+        series: Iterable[str] | None = None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Return the rows of a resolution between start and end as
+        [timestamp, value] pairs per series, oldest first. Rollup rows are
+        the means of closed buckets, stamped with the start of the bucket;
+        rows where a series had no reading are left out.
+        """
+        buffer = (
+            self.raw if resolution == ROLLUP_RAW else self.rollups[resolution].buffer
+        )
+        rows = buffer.window(start, end)
+        timestamps = buffer.timestamps
+        names = buffer.series.keys() if series is None else series
+        result: dict[str, list[tuple[float, float]]] = {}
+        for name in names:
+            column = buffer.series.get(name)
+            if column is None:
+                continue
+            result[name] = [
+                (timestamps[row], column[row])
+                for row in rows
+                if not math.isnan(column[row])
+            ]
+        return {
+            "resolution": resolution,
+            "bucket_seconds": ROLLUP_RESOLUTIONS[resolution],
+            "series": result,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "series": len(self.raw.series),
+            "nbytes": self.nbytes,
+            "rows": {
+                ROLLUP_RAW: len(self.raw),
+                **{name: len(rollup.buffer) for name, rollup in self.rollups.items()},
+            },
+        }
+
+
+@lru_cache(maxsize=8)
+def _circuit_series(circuit_ids: tuple[str, ...]) -> tuple[str, ...]:
+    # Circuit ids rarely change, so their series names are built once
+    return tuple(map(circuit_series, circuit_ids))
+
+
+def circuit_series(circuit_id: str) -> str:
+    """Series name of the power of a circuit."""
+    return f"{ENDPOINT_CIRCUITS}.{circuit_id}"
+
+
+def panel_series(reading: str) -> str:
+    """Series name of a panel power reading."""
+    return f"{ENDPOINT_PANEL}.{reading}"
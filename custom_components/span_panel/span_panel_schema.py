@@ -0,0 +1,394 @@
+"""Payload parsers, validated once per panel firmware version."""
+
+from __future__ import annotations
+
+import logging
+import operator
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import MISSING, dataclass, field
+from dataclasses import fields as dataclass_fields
+from types import MappingProxyType
+from typing import Any, Generic, TypeVar
+
+from .const import (ENDPOINT_BATTERY, ENDPOINT_CIRCUITS, ENDPOINT_PANEL,
+                    ENDPOINT_STATUS, PANEL_MAIN_RELAY_STATE_UNKNOWN_VALUE,
+                    CircuitPriority, CircuitRelayState)
+from .span_panel_branch_table import BranchTable
+from .span_panel_circuit import SpanPanelCircuit
+from .span_panel_data import SpanPanelData
+from .span_panel_hardware_status import SpanPanelHardwareStatus
+from .span_panel_storage_battery import SpanPanelStorageBattery
+
+_LOGGER = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT")
+
+UNKNOWN_FIRMWARE = "unknown"
+NUMBER = (int, float)
+
+# Raised by a parser when a payload does not have the shape it was built for
+_SHAPE_ERRORS = (AttributeError, KeyError, IndexError, TypeError, ValueError)
+_ABSENT = object()
+
+
+@dataclass(frozen=True)
+class SchemaField:
+    """A model field, where it sits in the payload and what it should hold."""
+
+    name: str
+    path: tuple[str, ...]
+    kind: type | tuple[type, ...]
+    default: Any
+    coerce: Callable[[Any], Any] | None = None
+    # Not sent by every firmware; its absence is not reported as drift
+    optional: bool = False
+
+    @property
+    def key(self) -> str:
+        return ".".join(self.path)
+
+    def lookup(self, data: Any) -> Any:
+        for key in self.path:
+            if not isinstance(data, dict) or key not in data:
+                return _ABSENT
+            data = data[key]
+        return data
+
+    def get(self, data: Any) -> Any:
+        """Read the field defensively, falling back to its default."""
+        value = self.lookup(data)
+        if value is _ABSENT or value is None:
+            return self.default
+        if self.coerce is not None:
+            try:
+                return self.coerce(value)
+            except _SHAPE_ERRORS:
+                return self.default
+        return value if isinstance(value, self.kind) else self.default
+
+    def reader(self, guarded: bool = False) -> Callable[[Any], Any]:
+        """
+        Return a function reading the field from a payload: via get() when
+        guarded, otherwise by plain subscripts that fail on another shape.
+        """
+        if guarded:
+            return self.get
+        path = self.path
+        read: Callable[[Any], Any]
+        if len(path) == 1:
+            read = operator.itemgetter(path[0])
+        else:
+
+            def walk(data: Any) -> Any:
+                for key in path:
+                    data = data[key]
+                return data
+
+            read = walk
+
+        if (coerce := self.coerce) is None:
+            return read
+        return lambda data: coerce(read(data))
+
+
+@dataclass(frozen=True)
+class SchemaDrift:
+    """Fields a firmware no longer sends, or sends with a different type."""
+
+    endpoint: str
+    firmware_version: str
+    missing: tuple[str, ...] = ()
+    retyped: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+
+    def __bool__(self) -> bool:
+        return bool(self.missing or self.retyped)
+
+    def merge(self, other: SchemaDrift) -> SchemaDrift:
+        return SchemaDrift(
+            endpoint=self.endpoint,
+            firmware_version=self.firmware_version,
+            missing=tuple(sorted({*self.missing, *other.missing})),
+            retyped=MappingProxyType({**self.retyped, **other.retyped}),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "firmware_version": self.firmware_version,
+            "missing": list(self.missing),
+            "retyped": dict(self.retyped),
+        }
+
+
+class PayloadSchema(Generic[ModelT]):
+    """
+    Maps a payload onto a frozen dataclass model. build_parser() returns a
+    parser reading each field with plain subscripts, so that a payload of a
+    known shape skips the defensive checks. Fields found missing or mistyped
+    when the parser is built are read defensively instead.
+    """
+
+    def __init__(
+        self, endpoint: str, model: type[ModelT], fields: Iterable[SchemaField]
+    ) -> None:
+        self.endpoint = endpoint
+        self.model = model
+        self.fields = tuple(fields)
+        # Every model field without a default has to come from the payload
+        names = {schema_field.name for schema_field in self.fields}
+        for model_field in dataclass_fields(model):  # type: ignore[arg-type]
+            if model_field.name in names:
+                names.discard(model_field.name)
+            elif model_field.default is MISSING:
+                raise ValueError(f"{endpoint} schema does not set {model_field.name}")
+        if names:
+            raise ValueError(f"{endpoint} schema sets unknown fields {sorted(names)}")
+
+    def survey(
+        self, samples: Iterable[Any], firmware_version: str
+    ) -> tuple[frozenset[str], SchemaDrift]:
+        """
+        Check sample payloads against the schema. Returns the fields that
+        cannot be read directly from every sample, and the drift to report.
+        """
+        guarded: set[str] = set()
+        missing: set[str] = set()
+        retyped: dict[str, str] = {}
+        for data in samples:
+            for schema_field in self.fields:
+                value = schema_field.lookup(data)
+                if value is _ABSENT:
+                    guarded.add(schema_field.name)
+                    if not schema_field.optional:
+                        missing.add(schema_field.key)
+                elif not isinstance(value, schema_field.kind):
+                    guarded.add(schema_field.name)
+                    retyped[schema_field.key] = type(value).__name__
+        return frozenset(guarded), SchemaDrift(
+            endpoint=self.endpoint,
+            firmware_version=firmware_version,
+            missing=tuple(sorted(missing)),
+            retyped=MappingProxyType(retyped),
+        )
+
+    def build_parser(self, guarded: Iterable[str] = ()) -> Callable[[Any], ModelT]:
+        """Return the parser, reading the guarded fields via SchemaField.get."""
+        guarded = frozenset(guarded)
+        model = self.model
+        readers = tuple(
+            (schema_field.name, schema_field.reader(schema_field.name in guarded))
+            for schema_field in self.fields
+        )
+
+        def parse(data: Any) -> ModelT:
+            return model(**{name: read(data) for name, read in readers})
+
+        return parse
+
+
+@dataclass
+class _SchemaParser(Generic[ModelT]):
+    parse: Callable[[Any], ModelT]
+    guarded: frozenset[str]
+
+
+class SpanPanelSchemaRegistry:
+    """
+    Parsers of one panel, keyed by endpoint and firmware version.
+
+    The first payload of an endpoint seen on a firmware version is validated
+    and a parser built for its shape; later payloads go straight through
+    that parser. Should one not fit after all, the parser is rebuilt with
+    the offending fields guarded and the drift is recorded rather than
+    failing the update.
+    """
+
+    def __init__(self) -> None:
+        self.firmware_version = UNKNOWN_FIRMWARE
+        self._parsers: dict[tuple[str, str], _SchemaParser[Any]] = {}
+        self.drift: dict[str, SchemaDrift] = {}
+
+    def set_firmware_version(self, firmware_version: str) -> None:
+        """Switch to the parsers of a firmware version, dropping the others."""
+        if firmware_version == self.firmware_version:
+            return
+        self.firmware_version = firmware_version
+        self._parsers = {
+            key: parser
+            for key, parser in self._parsers.items()
+            if key[1] == firmware_version
+        }
+
+    def parse(self, schema: PayloadSchema[ModelT], data: Any) -> ModelT:
+        """Parse one payload."""
+        key = (schema.endpoint, self.firmware_version)
+        if (parser := self._parsers.get(key)) is None:
+            parser = self._build(schema, (data,), frozenset())
+        try:
+            return parser.parse(data)
+        except _SHAPE_ERRORS:
+            return self._build(schema, (data,), parser.guarded).parse(data)
+
+    def parse_each(
+        self, schema: PayloadSchema[ModelT], payloads: Mapping[Any, Any]
+    ) -> dict[Any, ModelT]:
+        """Parse a mapping of payloads of the same shape, e.g. every circuit."""
+        key = (schema.endpoint, self.firmware_version)
+        if (parser := self._parsers.get(key)) is None:
+            parser = self._build(schema, payloads.values(), frozenset())
+        parsed: dict[Any, ModelT] = {}
+        for name, data in payloads.items():
+            try:
+                parsed[name] = parser.parse(data)
+            except _SHAPE_ERRORS:
+                parser = self._build(schema, (data,), parser.guarded)
+                parsed[name] = parser.parse(data)
+        return parsed
+
+    def _build(
+        self,
+        schema: PayloadSchema[ModelT],
+        samples: Iterable[Any],
+        guarded: frozenset[str],
+    ) -> _SchemaParser[ModelT]:
+        found, drift = schema.survey(samples, self.firmware_version)
+        parser = _SchemaParser(schema.build_parser(guarded | found), guarded | found)
+        self._parsers[(schema.endpoint, self.firmware_version)] = parser
+        if drift:
+            previous = self.drift.get(schema.endpoint)
+            if previous is not None and previous.firmware_version == drift.firmware_version:
+                drift = previous.merge(drift)
+            if drift != previous:
+                _LOGGER.warning(
+                    "Span Panel %s payload on firmware %s does not match the "
+                    "expected schema; missing: %s, changed type: %s",
+                    schema.endpoint,
+                    drift.firmware_version,
+                    ", ".join(drift.missing) or "none",
+                    ", ".join(f"{k} ({v})" for k, v in drift.retyped.items()) or "none",
+                )
+            self.drift[schema.endpoint] = drift
+        return parser
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "firmware_version": self.firmware_version,
+            "parsers": sorted(endpoint for endpoint, _ in self._parsers),
+            "drift": {
+                endpoint: drift.as_dict() for endpoint, drift in self.drift.items()
+            },
+        }
+
+
+STATUS_SCHEMA = PayloadSchema(
+    ENDPOINT_STATUS,
+    SpanPanelHardwareStatus,
+    (
+        SchemaField("firmware_version", ("software", "firmwareVersion"), str, UNKNOWN_FIRMWARE),
+        SchemaField("update_status", ("software", "updateStatus"), str, ""),
+        SchemaField("env", ("software", "env"), str, ""),
+        SchemaField("manufacturer", ("system", "manufacturer"), str, ""),
+        SchemaField("serial_number", ("system", "serial"), str, ""),
+        SchemaField("model", ("system", "model"), str, ""),
+        SchemaField("door_state", ("system", "doorState"), str, None),
+        SchemaField("uptime", ("system", "uptime"), int, 0),
+        SchemaField("is_ethernet_connected", ("network", "eth0Link"), bool, False),
+        SchemaField("is_wifi_connected", ("network", "wlanLink"), bool, False),
+        SchemaField("is_cellular_connected", ("network", "wwanLink"), bool, False),
+        # Firmware r202342 and newer prove proximity instead of counting
+        # unlock button presses
+        SchemaField(
+            "proximity_proven", ("system", "proximityProven"), bool, None, optional=True
+        ),
+        SchemaField(
+            "remaining_auth_unlock_button_presses",
+            ("system", "remainingAuthUnlockButtonPresses"),
+            int,
+            0,
+            optional=True,
+        ),
+    ),
+)
+
+PANEL_SCHEMA = PayloadSchema(
+    ENDPOINT_PANEL,
+    SpanPanelData,
+    (
+        SchemaField(
+            "main_relay_state",
+            ("mainRelayState",),
+            str,
+            PANEL_MAIN_RELAY_STATE_UNKNOWN_VALUE,
+            str,
+        ),
+        SchemaField(
+            "main_meter_energy_produced",
+            ("mainMeterEnergy", "producedEnergyWh"),
+            NUMBER,
+            0.0,
+            float,
+        ),
+        SchemaField(
+            "main_meter_energy_consumed",
+            ("mainMeterEnergy", "consumedEnergyWh"),
+            NUMBER,
+            0.0,
+            float,
+        ),
+        SchemaField("instant_grid_power", ("instantGridPowerW",), NUMBER, 0.0, float),
+        SchemaField("feedthrough_power", ("feedthroughPowerW",), NUMBER, 0.0, float),
+        SchemaField(
+            "feedthrough_energy_produced",
+            ("feedthroughEnergy", "producedEnergyWh"),
+            NUMBER,
+            0.0,
+            float,
+        ),
+        SchemaField(
+            "feedthrough_energy_consumed",
+            ("feedthroughEnergy", "consumedEnergyWh"),
+            NUMBER,
+            0.0,
+            float,
+        ),
+        SchemaField("grid_sample_start_ms", ("gridSampleStartMs",), int, 0, int),
+        SchemaField("grid_sample_end_ms", ("gridSampleEndMs",), int, 0, int),
+        SchemaField("dsm_grid_state", ("dsmGridState",), str, "", str),
+        SchemaField("dsm_state", ("dsmState",), str, "", str),
+        SchemaField("current_run_config", ("currentRunConfig",), str, "", str),
+        SchemaField(
+            "branches",
+            ("branches",),
+            list,
+            BranchTable.empty(),
+            BranchTable.from_payload,
+        ),
+    ),
+)
+
+CIRCUIT_SCHEMA = PayloadSchema(
+    ENDPOINT_CIRCUITS,
+    SpanPanelCircuit,
+    (
+        SchemaField("circuit_id", ("id",), str, ""),
+        SchemaField("name", ("name",), str, ""),
+        SchemaField(
+            "relay_state", ("relayState",), str, CircuitRelayState.UNKNOWN.name
+        ),
+        SchemaField("instant_power", ("instantPowerW",), NUMBER, 0.0),
+        SchemaField("instant_power_update_time", ("instantPowerUpdateTimeS",), int, 0),
+        SchemaField("produced_energy", ("producedEnergyWh",), NUMBER, 0.0),
+        SchemaField("consumed_energy", ("consumedEnergyWh",), NUMBER, 0.0),
+        SchemaField("energy_accum_update_time", ("energyAccumUpdateTimeS",), int, 0),
+        SchemaField("tabs", ("tabs",), list, ()),
+        SchemaField("priority", ("priority",), str, CircuitPriority.UNKNOWN.name),
+        SchemaField("is_user_controllable", ("isUserControllable",), bool, False),
+        SchemaField("is_sheddable", ("isSheddable",), bool, False),
+        SchemaField("is_never_backup", ("isNeverBackup",), bool, False),
+    ),
+)
+
+STORAGE_BATTERY_SCHEMA = PayloadSchema(
+    ENDPOINT_BATTERY,
+    SpanPanelStorageBattery,
+    (SchemaField("storage_battery_percentage", ("percentage",), NUMBER, 0),),
+)
@@ -0,0 +1,53 @@
+"""Read-only snapshot of the data known about a Span Panel."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any
+
+from .span_panel_aggregates import SpanPanelAggregates
+from .span_panel_circuit import SpanPanelCircuit
+from .span_panel_circuit_table import CircuitTable
+from .span_panel_data import SpanPanelData
+from .span_panel_hardware_status import SpanPanelHardwareStatus
+from .span_panel_storage_battery import SpanPanelStorageBattery
+
+
+@dataclass(frozen=True)
+class SpanPanelSnapshot:
+    """
+    Immutable view of a panel, replaced as a whole whenever any part of it
+    changes. Readers share one instance without copying; the generation
+    increases with every replacement so a change can be detected cheaply.
+    """
+
+    generation: int = 0
+    status: SpanPanelHardwareStatus | None = None
+    panel: SpanPanelData | None = None
+    circuits: Mapping[str, SpanPanelCircuit] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    storage_battery: SpanPanelStorageBattery | None = None
+    # Circuit telemetry in columns, kept in step with circuits
+    circuit_table: CircuitTable = field(default_factory=CircuitTable.empty)
+
+    @cached_property
+    def aggregates(self) -> SpanPanelAggregates:
+        """Panel-wide totals, computed once on first use."""
+        return SpanPanelAggregates.compute(
+            self.circuit_table,
+            None if self.panel is None else self.panel.instant_grid_power,
+        )
+
+    def evolve(self, **changes: Any) -> SpanPanelSnapshot:
+        """Return the next generation with the given parts replaced."""
+        if "circuits" in changes:
+            changes["circuits"] = MappingProxyType(changes["circuits"])
+            if "circuit_table" not in changes:
+                changes["circuit_table"] = self.circuit_table.evolve(
+                    changes["circuits"]
+                )
+        return replace(self, generation=self.generation + 1, **changes)
@@ -0,0 +1,72 @@
+"""Incremental panel updates pushed by a streaming source."""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CircuitPowerEvent:
+    """New power reading, and optionally energy totals, for one circuit."""
+
+    circuit_id: str
+    instant_power: float
+    produced_energy: float | None = None
+    consumed_energy: float | None = None
+
+
+@dataclass(frozen=True)
+class CircuitRelayEvent:
+    """Relay of one circuit changed state."""
+
+    circuit_id: str
+    relay_state: str
+
+
+@dataclass(frozen=True)
+class PanelMeterEvent:
+    """New main meter reading. Fields left as None keep their value."""
+
+    instant_grid_power: float
+    main_meter_energy_produced: float | None = None
+    main_meter_energy_consumed: float | None = None
+    feedthrough_power: float | None = None
+
+
+SpanPanelEvent = CircuitPowerEvent | CircuitRelayEvent | PanelMeterEvent
+
+
+class SpanPanelEventSource(ABC):
+    """
+    Source of incremental panel updates. Implementations yield events until
+    the stream ends; polling reconciles anything missed in between.
+    """
+
+    @abstractmethod
+    def events(self) -> AsyncIterator[SpanPanelEvent]:
+        """Return an async iterator over the events of the stream."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Stop the stream, ending the iterator returned by events()."""
+
+
+class SpanPanelQueueEventSource(SpanPanelEventSource):
+    """Local stand-in source fed by push(), used for tests and bridges."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[SpanPanelEvent | None] = asyncio.Queue()
+
+    def push(self, event: SpanPanelEvent) -> None:
+        """Queue an event for delivery."""
+        self._queue.put_nowait(event)
+
+    async def events(self) -> AsyncIterator[SpanPanelEvent]:
+        while (event := await self._queue.get()) is not None:
+            yield event
+
+    async def close(self) -> None:
+        self._queue.put_nowait(None)
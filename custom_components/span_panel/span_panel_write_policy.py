@@ -0,0 +1,93 @@
+"""Limits on how often sensor states are written."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class WritePolicy:
+    """
+    When a new sensor value is worth a state write. A change no larger than
+    the absolute deadband, or the relative deadband as a fraction of the
+    last written value, is held back, as is any write sooner than
+    min_interval seconds after the previous one. A heartbeat, if set,
+    forces a write at least that many seconds apart. All zero writes every
+    value.
+    """
+
+    absolute_deadband: float = 0.0
+    relative_deadband: float = 0.0
+    min_interval: float = 0.0
+    heartbeat: float = 0.0
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.absolute_deadband
+            or self.relative_deadband
+            or self.min_interval
+            or self.heartbeat
+        )
+
+
+class StateWriteGate:
+    """Applies a write policy to the values of one entity."""
+
+    def __init__(self, policy: WritePolicy) -> None:
+        self.policy = policy
+        self.value: Any = None
+        self.written_at: float | None = None
+
+    def admit(self, value: Any, now: float) -> bool:
+        """Return True and remember the value if it should be written."""
+        if self._should_write(value, now):
+            self.value = value
+            self.written_at = now
+            return True
+        return False
+
+    def trailing_write_in(self, value: Any, now: float) -> float:
+        """
+        Seconds until min_interval stops holding back a value that clears
+        the deadband, 0 when nothing but the deadband holds it back.
+        """
+        if self.written_at is None or not self._beyond_deadband(value):
+            return 0.0
+        return max(self.written_at + self.policy.min_interval - now, 0.0)
+
+    def heartbeat_due_in(self, now: float) -> float:
+        """Seconds until the heartbeat forces a write, 0 when it is due."""
+        if self.written_at is None:
+            return 0.0
+        return max(self.written_at + self.policy.heartbeat - now, 0.0)
+
+    def reset(self) -> None:
+        """Forget the last write, so that the next value is always written."""
+        self.value = None
+        self.written_at = None
+
+    def _should_write(self, value: Any, now: float) -> bool:
+        if (
+            self.written_at is None
+            or not isinstance(value, (int, float))
+            or not isinstance(self.value, (int, float))
+        ):
+            return True
+        policy = self.policy
+        elapsed = now - self.written_at
+        if policy.heartbeat and elapsed >= policy.heartbeat:
+            return True
+        if elapsed < policy.min_interval:
+            return False
+        return self._beyond_deadband(value)
+
+    def _beyond_deadband(self, value: Any) -> bool:
+        last = self.value
+        if not isinstance(value, (int, float)) or not isinstance(last, (int, float)):
+            return True
+        policy = self.policy
+        threshold = max(
+            policy.absolute_deadband, abs(last) * policy.relative_deadband
+        )
+        return not threshold or abs(value - last) > threshold
@@ -10,8 +10,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import COORDINATOR, DOMAIN, USE_DEVICE_PREFIX, CircuitRelayState
-from .coordinator import SpanPanelCoordinator
+from .const import (COORDINATOR, DOMAIN, ENDPOINT_CIRCUITS, USE_DEVICE_PREFIX,
+                    CircuitRelayState)
+from .coordinator import SpanPanelCoordinator, SpanPanelListenerContext
 from .span_panel import SpanPanel
 from .util import panel_to_device_info
 
@@ -31,7 +32,12 @@ class SpanPanelCircuitsSwitch(CoordinatorEntity[SpanPanelCoordinator], SwitchEnt
         self.id = id
         self._attr_unique_id = f"span_{span_panel.status.serial_number}_relay_{id}"
         self._attr_device_info = panel_to_device_info(span_panel)
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            context=SpanPanelListenerContext(
+                ENDPOINT_CIRCUITS, id, frozenset({"relay_state"})
+            ),
+        )
 
     def turn_on(self, **kwargs: Any) -> None:
         """Synchronously turn the switch on."""
@@ -43,27 +49,22 @@ class SpanPanelCircuitsSwitch(CoordinatorEntity[SpanPanelCoordinator], SwitchEnt
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
-        span_panel: SpanPanel = self.coordinator.data
-        circuits = span_panel.circuits  # Get atomic snapshot of circuits
-        if self.id in circuits:
-            # Create a copy of the circuit for the operation
-            curr_circuit = circuits[self.id].copy()
-            # Perform the state change
-            await span_panel.api.set_relay(curr_circuit, CircuitRelayState.CLOSED)
-            # Request refresh to get the new state
-            await self.coordinator.async_request_refresh()
+        await self._async_set_relay(CircuitRelayState.CLOSED)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off."""
+        await self._async_set_relay(CircuitRelayState.OPEN)
+
+    async def _async_set_relay(self, state: CircuitRelayState) -> None:
+        """Set the relay, showing the new state until the panel confirms it."""
         span_panel: SpanPanel = self.coordinator.data
-        circuits = span_panel.circuits  # Get atomic snapshot of circuits
-        if self.id in circuits:
-            # Create a copy of the circuit for the operation
-            curr_circuit = circuits[self.id].copy()
-            # Perform the state change
-            await span_panel.api.set_relay(curr_circuit, CircuitRelayState.OPEN)
-            # Request refresh to get the new state
-            await self.coordinator.async_request_refresh()
+        if self.id in span_panel.circuits:
+            await span_panel.set_circuit_relay(
+                self.id,
+                state,
+                # Only the entities of the changed circuit field are notified
+                notify=self.coordinator.async_update_listeners,
+            )
 
     @cached_property
     def icon(self):
@@ -83,12 +84,8 @@ class SpanPanelCircuitsSwitch(CoordinatorEntity[SpanPanelCoordinator], SwitchEnt
     def is_on(self) -> bool | None:
         """Return true if the switch is on."""
         span_panel: SpanPanel = self.coordinator.data
-        # Get atomic snapshot of circuits data
-        circuits = span_panel.circuits
-        circuit = circuits.get(self.id)
+        circuit = span_panel.circuits.get(self.id)
         if circuit:
-            # Use copy to ensure atomic state
-            circuit = circuit.copy()
             return circuit.relay_state == CircuitRelayState.CLOSED.name
         return None
 
@@ -0,0 +1,39 @@
+"""Websocket commands for Span Panel."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+
+from .const import COORDINATOR, DOMAIN
+from .services import (ATTR_CONFIG_ENTRY_ID, QUERY_ROLLUPS_FIELDS,
+                       query_rollups, resolve_entry_id)
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): f"{DOMAIN}/query_rollups", **QUERY_ROLLUPS_FIELDS}
+)
+@callback
+def websocket_query_rollups(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return a window of the in-memory power history of a panel."""
+    try:
+        entry_id = resolve_entry_id(hass, msg.get(ATTR_CONFIG_ENTRY_ID))
+        result = query_rollups(hass.data[DOMAIN][entry_id][COORDINATOR], msg)
+    except ServiceValidationError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+    connection.send_result(msg["id"], result)
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the Span Panel websocket commands."""
+    websocket_api.async_register_command(hass, websocket_query_rollups)
@@ -0,0 +1,398 @@
+#!/usr/bin/env python
+"""
+Local SPAN panel emulator for load and fault testing.
+
+The emulator serves the endpoints used by the integration with circuit power
+and energy that evolve over time. It can be used in-process as an httpx
+transport, or as a localhost HTTP server:
+
+    python scripts/span_panel_emulator.py --circuits 64 --port 8080
+
+    emulator = SpanPanelEmulator(circuit_count=200, faults=EmulatorFaults(latency=0.05))
+    client = httpx.AsyncClient(transport=emulator.transport())
+    panel = SpanPanel("span.local", access_token=emulator.access_token, async_client=client)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+API_PREFIX = "/api/v1"
+BRANCH_COUNT = 32
+PRIORITIES = ("MUST_HAVE", "NICE_TO_HAVE", "NON_ESSENTIAL")
+CIRCUIT_NAMES = (
+    "Kitchen",
+    "Refrigerator",
+    "Dishwasher",
+    "Microwave",
+    "Washer",
+    "Dryer",
+    "Furnace",
+    "Air Conditioner",
+    "Water Heater",
+    "EV Charger",
+    "Garage",
+    "Office",
+    "Bedroom",
+    "Living Room",
+    "Pool Pump",
+    "Lighting",
+)
+
+
+@dataclass
+class EmulatorFaults:
+    """Faults injected into responses. Rates are probabilities per request."""
+
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    drop_rate: float = 0.0
+    empty_rate: float = 0.0
+    unauthorized_rate: float = 0.0
+
+
+@dataclass
+class EmulatedCircuit:
+    circuit_id: str
+    name: str
+    tabs: list[int]
+    base_power: float
+    priority: str
+    relay_state: str = "CLOSED"
+    instant_power: float = 0.0
+    produced_energy: float = 0.0
+    consumed_energy: float = 0.0
+    is_user_controllable: bool = True
+    is_sheddable: bool = False
+    is_never_backup: bool = False
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "id": self.circuit_id,
+            "name": self.name,
+            "relayState": self.relay_state,
+            # Consumption is reported as negative power, as by the branches
+            "instantPowerW": -self.instant_power,
+            "instantPowerUpdateTimeS": int(now),
+            "producedEnergyWh": self.produced_energy,
+            "consumedEnergyWh": self.consumed_energy,
+            "energyAccumUpdateTimeS": int(now),
+            "tabs": self.tabs,
+            "priority": self.priority,
+            "isUserControllable": self.is_user_controllable,
+            "isSheddable": self.is_sheddable,
+            "isNeverBackup": self.is_never_backup,
+        }
+
+
+@dataclass
+class EmulatorStats:
+    requests: int = 0
+    dropped: int = 0
+    empty: int = 0
+    unauthorized: int = 0
+    by_path: dict[str, int] = field(default_factory=dict)
+
+
+class SpanPanelEmulator:
+    """Emulated panel state and request handling shared by both transports."""
+
+    def __init__(
+        self,
+        circuit_count: int = 16,
+        faults: EmulatorFaults | None = None,
+        seed: int = 0,
+        clock: Callable[[], float] = time.time,
+        firmware_version: str = "spanos2/r202342/04",
+        serial_number: str = "nj-2316-005k6",
+        access_token: str | None = None,
+    ) -> None:
+        self.faults = faults or EmulatorFaults()
+        self.firmware_version = firmware_version
+        self.serial_number = serial_number
+        self.access_token = access_token or uuid.UUID(int=seed).hex
+        self.door_state = "CLOSED"
+        self.battery_percentage = 80
+        self.stats = EmulatorStats()
+        self._random = random.Random(seed)  # nosec B311
+        self._clock = clock
+        self._started = clock()
+        self._updated = self._started
+        self.circuits: dict[str, EmulatedCircuit] = {}
+        for index in range(circuit_count):
+            circuit_id = uuid.UUID(int=self._random.getrandbits(128)).hex
+            name = CIRCUIT_NAMES[index % len(CIRCUIT_NAMES)]
+            if index >= len(CIRCUIT_NAMES):
+                name = f"{name} {index // len(CIRCUIT_NAMES) + 1}"
+            self.circuits[circuit_id] = EmulatedCircuit(
+                circuit_id=circuit_id,
+                name=name,
+                tabs=[index + 1],
+                base_power=self._random.uniform(5.0, 1500.0),
+                priority=PRIORITIES[index % len(PRIORITIES)],
+                is_sheddable=index % 3 == 2,
+                is_never_backup=index % 5 == 4,
+            )
+        self.branch_count = max(BRANCH_COUNT, circuit_count)
+        self._evolve()
+
+    # State evolution
+
+    def _evolve(self) -> None:
+        """Advance power as a bounded random walk and integrate energy."""
+        now = self._clock()
+        elapsed_hours = max(now - self._updated, 0.0) / 3600
+        self._updated = now
+        for circuit in self.circuits.values():
+            if circuit.relay_state != "CLOSED":
+                circuit.instant_power = 0.0
+                continue
+            drift = self._random.gauss(0, circuit.base_power * 0.05)
+            power = circuit.instant_power or circuit.base_power
+            circuit.instant_power = min(
+                max(power + drift, 0.0), circuit.base_power * 2
+            )
+            circuit.consumed_energy += circuit.instant_power * elapsed_hours
+
+    @property
+    def grid_power(self) -> float:
+        return sum(circuit.instant_power for circuit in self.circuits.values())
+
+    # Payloads
+
+    def status_payload(self) -> dict[str, Any]:
+        return {
+            "software": {
+                "firmwareVersion": self.firmware_version,
+                "updateStatus": "IDLE",
+                "env": "prod",
+            },
+            "system": {
+                "manufacturer": "Span",
+                "serial": self.serial_number,
+                "model": "00200",
+                "doorState": self.door_state,
+                "proximityProven": True,
+                "uptime": int(self._clock() - self._started),
+            },
+            "network": {"eth0Link": True, "wlanLink": True, "wwanLink": False},
+        }
+
+    def panel_payload(self, empty: bool = False) -> dict[str, Any]:
+        now = self._clock()
+        consumed = sum(c.consumed_energy for c in self.circuits.values())
+        branches = []
+        tab_power = {
+            tab: circuit.instant_power / len(circuit.tabs)
+            for circuit in self.circuits.values()
+            for tab in circuit.tabs
+        }
+        for index in range(self.branch_count):
+            power = tab_power.get(index + 1, 0.0)
+            branches.append(
+                {
+                    "id": index + 1,
+                    "relayState": "CLOSED",
+                    "instantPowerW": -power,
+                    "importedActiveEnergyWh": 0.0,
+                    "exportedActiveEnergyWh": power,
+                    "measureStartTsMs": int(now * 1000),
+                    "measureDurationMs": 1000,
+                    "isMeasureValid": True,
+                }
+            )
+        return {
+            "mainRelayState": "UNKNOWN" if empty else "CLOSED",
+            "mainMeterEnergy": {
+                "producedEnergyWh": 0.0,
+                "consumedEnergyWh": consumed,
+            },
+            "instantGridPowerW": self.grid_power,
+            "feedthroughPowerW": 0.0,
+            "feedthroughEnergy": {"producedEnergyWh": 0.0, "consumedEnergyWh": 0.0},
+            "gridSampleStartMs": int(now * 1000),
+            "gridSampleEndMs": int(now * 1000) + 1,
+            "dsmGridState": "DSM_GRID_UP",
+            "dsmState": "DSM_ON_GRID",
+            "currentRunConfig": "PANEL_ON_GRID",
+            "branches": branches,
+        }
+
+    def circuits_payload(self, empty: bool = False) -> dict[str, Any]:
+        now = self._clock()
+        if empty:
+            return {"circuits": {}}
+        return {
+            "circuits": {
+                circuit_id: circuit.as_dict(now)
+                for circuit_id, circuit in self.circuits.items()
+            }
+        }
+
+    def battery_payload(self, empty: bool = False) -> dict[str, Any]:
+        return {"soe": {} if empty else {"percentage": self.battery_percentage}}
+
+    # Request handling
+
+    def handle(
+        self, method: str, path: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict[str, Any]]:
+        """Return the status code and JSON payload for a request."""
+        self.stats.requests += 1
+        self.stats.by_path[path] = self.stats.by_path.get(path, 0) + 1
+        self._evolve()
+
+        if not path.startswith(API_PREFIX):
+            return 404, {"detail": "Not Found"}
+        route = path[len(API_PREFIX):]
+
+        if route == "/status":
+            return 200, self.status_payload()
+        if route == "/auth/register" and method == "POST":
+            return 200, {"accessToken": self.access_token, "tokenType": "Bearer"}
+
+        authorization = {k.lower(): v for k, v in headers.items()}.get("authorization")
+        if authorization != f"Bearer {self.access_token}" or (
+            self._random.random() < self.faults.unauthorized_rate
+        ):
+            self.stats.unauthorized += 1
+            return 401, {"detail": "Not Authenticated"}
+
+        empty = self._random.random() < self.faults.empty_rate
+        if empty:
+            self.stats.empty += 1
+        if route == "/panel":
+            return 200, self.panel_payload(empty)
+        if route == "/circuits":
+            return 200, self.circuits_payload(empty)
+        if route == "/storage/soe":
+            return 200, self.battery_payload(empty)
+        if route.startswith("/circuits/"):
+            circuit = self.circuits.get(route[len("/circuits/"):])
+            if circuit is None:
+                return 404, {"detail": "Circuit not found"}
+            if method == "POST":
+                self._apply_command(circuit, json.loads(body or b"{}"))
+            return 200, circuit.as_dict(self._clock())
+        return 404, {"detail": "Not Found"}
+
+    @staticmethod
+    def _apply_command(circuit: EmulatedCircuit, command: dict[str, Any]) -> None:
+        if "relayStateIn" in command:
+            circuit.relay_state = command["relayStateIn"]["relayState"]
+        if "priorityIn" in command:
+            circuit.priority = command["priorityIn"]["priority"]
+
+    def latency(self) -> float:
+        jitter = self._random.uniform(0, self.faults.latency_jitter)
+        return self.faults.latency + jitter
+
+    def should_drop(self) -> bool:
+        dropped = self._random.random() < self.faults.drop_rate
+        if dropped:
+            self.stats.dropped += 1
+        return dropped
+
+    def transport(self) -> EmulatorTransport:
+        return EmulatorTransport(self)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Serve the emulator over HTTP until cancelled."""
+        from aiohttp import web
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            delay = self.latency()
+            if delay:
+                await asyncio.sleep(delay)
+            if self.should_drop():
+                if request.transport is not None:
+                    request.transport.close()
+                return web.Response(status=503)
+            status, payload = self.handle(
+                request.method, request.path, dict(request.headers), await request.read()
+            )
+            return web.json_response(payload, status=status)
+
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+
+class EmulatorTransport(httpx.AsyncBaseTransport):
+    """In-process httpx transport backed by a SpanPanelEmulator."""
+
+    def __init__(self, emulator: SpanPanelEmulator) -> None:
+        self.emulator = emulator
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.emulator.latency()
+        if delay:
+            await asyncio.sleep(delay)
+        if self.emulator.should_drop():
+            raise httpx.RemoteProtocolError(
+                "Server disconnected without sending a response.", request=request
+            )
+        status, payload = self.emulator.handle(
+            request.method, request.url.path, dict(request.headers), await request.aread()
+        )
+        return httpx.Response(
+            status,
+            headers={"Content-Type": "application/json"},
+            content=json.dumps(payload).encode(),
+            request=request,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--circuits", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--empty-rate", type=float, default=0.0)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    emulator = SpanPanelEmulator(
+        circuit_count=args.circuits,
+        seed=args.seed,
+        faults=EmulatorFaults(
+            latency=args.latency,
+            latency_jitter=args.latency_jitter,
+            drop_rate=args.drop_rate,
+            empty_rate=args.empty_rate,
+            unauthorized_rate=args.unauthorized_rate,
+        ),
+    )
+    print(
+        f"Emulating {args.circuits} circuits on http://{args.host}:{args.port}, "
+        f"access token {emulator.access_token}"
+    )
+    try:
+        asyncio.run(emulator.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Tests for the panel-wide totals."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.span_panel.const import CircuitPriority
+from custom_components.span_panel.span_panel_aggregates import SpanPanelAggregates
+from custom_components.span_panel.span_panel_circuit import SpanPanelCircuit
+from custom_components.span_panel.span_panel_circuit_table import CircuitTable
+
+
+def make_circuit(
+    circuit_id: str,
+    instant_power: float,
+    tabs: list[int],
+    priority: CircuitPriority = CircuitPriority.MUST_HAVE,
+) -> SpanPanelCircuit:
+    return SpanPanelCircuit(
+        circuit_id=circuit_id,
+        name=circuit_id,
+        relay_state="CLOSED",
+        instant_power=instant_power,
+        instant_power_update_time=0,
+        produced_energy=0.0,
+        consumed_energy=0.0,
+        energy_accum_update_time=0,
+        tabs=tabs,
+        priority=priority.name,
+        is_user_controllable=True,
+        is_sheddable=False,
+        is_never_backup=False,
+    )
+
+
+def make_table(*circuits: SpanPanelCircuit) -> CircuitTable:
+    return CircuitTable.empty().evolve(
+        {circuit.circuit_id: circuit for circuit in circuits}
+    )
+
+
+def test_producing_circuit_nets_out_against_the_grid() -> None:
+    # The panel reports consumption as negative instant power
+    table = make_table(
+        make_circuit("load", -1000.0, [1]),
+        make_circuit("solar", 3000.0, [3], CircuitPriority.NON_ESSENTIAL),
+    )
+
+    aggregates = SpanPanelAggregates.compute(table, grid_power=-2000.0)
+
+    assert aggregates.circuits_power == pytest.approx(-2000.0)
+    assert aggregates.unmetered_power == pytest.approx(0.0)
+    assert aggregates.leg1_power == pytest.approx(1000.0)
+    assert aggregates.leg2_power == pytest.approx(-3000.0)
+    assert aggregates.priority_power[CircuitPriority.MUST_HAVE] == pytest.approx(
+        1000.0
+    )
+    assert aggregates.priority_power[
+        CircuitPriority.NON_ESSENTIAL
+    ] == pytest.approx(-3000.0)
+
+
+def test_top_consumers_leave_out_producers() -> None:
+    table = make_table(
+        make_circuit("solar", 3000.0, [1]),
+        make_circuit("small", -200.0, [3]),
+        make_circuit("large", -1500.0, [5]),
+    )
+
+    aggregates = SpanPanelAggregates.compute(table, grid_power=None)
+
+    assert aggregates.top_consumers == (("large", 1500.0), ("small", 200.0))
+    assert aggregates.unmetered_power is None
@@ -0,0 +1,69 @@
+"""Tests for the columnar circuit table."""
+
+from __future__ import annotations
+
+from dataclasses import fields, replace
+
+from custom_components.span_panel.const import CircuitPriority, CircuitRelayState
+from custom_components.span_panel.span_panel_circuit import SpanPanelCircuit
+from custom_components.span_panel.span_panel_circuit_table import CircuitTable
+
+CIRCUITS = {
+    circuit_id: SpanPanelCircuit(
+        circuit_id=circuit_id,
+        name=circuit_id,
+        relay_state="CLOSED",
+        instant_power=-100.0 * tab,
+        instant_power_update_time=1,
+        produced_energy=0.0,
+        consumed_energy=10.0 * tab,
+        energy_accum_update_time=1,
+        tabs=[tab],
+        priority="MUST_HAVE",
+        is_user_controllable=True,
+        is_sheddable=False,
+        is_never_backup=False,
+    )
+    for tab, circuit_id in enumerate(("a", "b", "c"), start=1)
+}
+
+
+def assert_same_columns(table: CircuitTable, expected: CircuitTable) -> None:
+    for column in fields(CircuitTable):
+        assert getattr(table, column.name) == getattr(expected, column.name)
+
+
+def test_evolve_rewrites_only_changed_rows() -> None:
+    table = CircuitTable.empty().evolve(CIRCUITS)
+    circuits = {
+        **CIRCUITS,
+        "b": replace(CIRCUITS["b"], instant_power=-500.0, consumed_energy=99.0),
+        "c": replace(
+            CIRCUITS["c"], relay_state="OPEN", priority="NON_ESSENTIAL", tabs=[2]
+        ),
+    }
+    evolved = table.evolve(circuits)
+    assert_same_columns(evolved, CircuitTable.empty().evolve(circuits))
+    assert evolved.instant_power[evolved.index["b"]] == -500.0
+    assert evolved.relay_state_of(evolved.index["c"]) is CircuitRelayState.OPEN
+    assert evolved.priority_of(evolved.index["c"]) is CircuitPriority.NON_ESSENTIAL
+    assert evolved.leg2_share[evolved.index["c"]] == 0.0
+    # The previous table is left as it was
+    assert table.instant_power[table.index["b"]] == -200.0
+
+
+def test_evolve_with_new_circuit_ids_rebuilds_the_table() -> None:
+    table = CircuitTable.empty().evolve(CIRCUITS)
+    circuits = {"c": CIRCUITS["c"], "a": CIRCUITS["a"]}
+    evolved = table.evolve(circuits)
+    assert evolved.ids == ("c", "a")
+    assert_same_columns(evolved, CircuitTable.empty().evolve(circuits))
+
+
+def test_replace_circuit() -> None:
+    table = CircuitTable.empty().evolve(CIRCUITS)
+    circuit = replace(CIRCUITS["a"], instant_power=-42.0)
+    replaced = table.replace_circuit(circuit)
+    assert replaced.instant_power[replaced.index["a"]] == -42.0
+    assert replaced.circuits[replaced.index["a"]] is circuit
+    assert table.replace_circuit(replace(circuit, circuit_id="x")) is table
@@ -0,0 +1,70 @@
+"""Tests for the sensor state write policy."""
+
+from __future__ import annotations
+
+from custom_components.span_panel.span_panel_write_policy import (StateWriteGate,
+                                                                  WritePolicy)
+
+
+def test_first_value_is_always_written() -> None:
+    gate = StateWriteGate(WritePolicy(absolute_deadband=10, min_interval=30))
+    assert gate.admit(100.0, 0.0)
+    assert gate.value == 100.0
+    assert gate.written_at == 0.0
+
+
+def test_deadband_holds_back_small_changes() -> None:
+    gate = StateWriteGate(WritePolicy(absolute_deadband=10, relative_deadband=0.05))
+    gate.admit(1000.0, 0.0)
+    # The relative deadband, 50 W here, is the larger of the two
+    assert not gate.admit(1040.0, 1.0)
+    assert gate.admit(1060.0, 2.0)
+    assert gate.value == 1060.0
+
+
+def test_min_interval_holds_back_early_writes() -> None:
+    gate = StateWriteGate(WritePolicy(min_interval=30))
+    gate.admit(100.0, 0.0)
+    assert not gate.admit(500.0, 10.0)
+    assert gate.value == 100.0
+    assert gate.admit(500.0, 30.0)
+
+
+def test_heartbeat_writes_an_unchanged_value() -> None:
+    gate = StateWriteGate(WritePolicy(absolute_deadband=10, heartbeat=60))
+    gate.admit(100.0, 0.0)
+    assert gate.heartbeat_due_in(20.0) == 40.0
+    assert not gate.admit(101.0, 20.0)
+    assert gate.heartbeat_due_in(60.0) == 0.0
+    assert gate.admit(101.0, 60.0)
+
+
+def test_non_numeric_values_bypass_the_policy() -> None:
+    gate = StateWriteGate(WritePolicy(absolute_deadband=10, min_interval=30))
+    gate.admit(100.0, 0.0)
+    assert gate.admit("unknown", 1.0)
+    assert gate.admit(100.0, 2.0)
+
+
+def test_trailing_write_for_a_change_held_back_by_min_interval() -> None:
+    gate = StateWriteGate(WritePolicy(absolute_deadband=10, min_interval=30))
+    gate.admit(100.0, 0.0)
+    assert not gate.admit(500.0, 10.0)
+    assert gate.trailing_write_in(500.0, 10.0) == 20.0
+    assert gate.trailing_write_in(500.0, 30.0) == 0.0
+    assert gate.admit(500.0, 30.0)
+
+
+def test_no_trailing_write_for_a_change_within_the_deadband() -> None:
+    gate = StateWriteGate(WritePolicy(absolute_deadband=10, min_interval=30))
+    gate.admit(100.0, 0.0)
+    assert not gate.admit(105.0, 10.0)
+    assert gate.trailing_write_in(105.0, 10.0) == 0.0
+
+
+def test_reset_writes_the_next_value() -> None:
+    gate = StateWriteGate(WritePolicy(min_interval=30))
+    gate.admit(100.0, 0.0)
+    gate.reset()
+    assert gate.trailing_write_in(500.0, 1.0) == 0.0
+    assert gate.admit(500.0, 1.0)